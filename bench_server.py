@@ -0,0 +1,97 @@
+"""
+Load test for the HTTP render service.
+
+    python bench_server.py                          # in-process server on a free localhost port
+    python bench_server.py --url http://127.0.0.1:8765 --clients 32
+
+Each client thread POSTs specs drawn from a small pool of distinct texts, so the
+run mixes misses, coalesced duplicates and LRU hits. Prints client-side latency
+and throughput, then the server's own /stats. Exits non-zero if any request failed
+or two responses for the same spec differed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from typing import Dict, List
+
+
+def _post(url: str, spec: Dict) -> bytes:
+    req = urllib.request.Request(
+        url + "/render", data=json.dumps(spec).encode("utf-8"),
+        headers={"Content-Type": "application/json"}, method="POST",
+    )
+    with urllib.request.urlopen(req) as r:
+        return r.read()
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Hammer the render service from many client threads.")
+    p.add_argument("--url", help="Existing server to test (default: start one on localhost)")
+    p.add_argument("--clients", type=int, default=16, help="Concurrent client threads")
+    p.add_argument("--requests", type=int, default=50, help="Requests per client")
+    p.add_argument("--specs", type=int, default=8, help="Distinct specs in the pool")
+    p.add_argument("--frames", type=int, default=2000, help="Frames per spec")
+    ns = p.parse_args(argv)
+
+    httpd = None
+    url = ns.url
+    if not url:
+        from gradient_text.server import RenderServer, RenderService
+
+        httpd = RenderServer(("127.0.0.1", 0), RenderService())
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        url = httpd.url
+
+    pool = [
+        {"text": f"play.example{k}.com", "colors_sets": [["#3B28CC", "#3E7FF5", "#58E2F0"]], "frames": ns.frames}
+        for k in range(ns.specs)
+    ]
+    seen: Dict[int, bytes] = {}
+    latencies: List[float] = []
+    failures: List[str] = []
+    guard = threading.Lock()
+
+    def client(c: int) -> None:
+        for n in range(ns.requests):
+            k = (c * 7 + n) % len(pool)
+            start = time.perf_counter()
+            try:
+                body = _post(url, pool[k])
+            except Exception as e:
+                with guard:
+                    failures.append(f"spec {k}: {e}")
+                continue
+            ms = (time.perf_counter() - start) * 1000
+            with guard:
+                latencies.append(ms)
+                if seen.setdefault(k, body) != body:
+                    failures.append(f"spec {k}: response differs from an earlier one")
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(ns.clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0
+    print(f"{len(latencies)} ok / {len(failures)} failed in {elapsed:.2f} s ({len(latencies) / elapsed:.0f} req/s); "
+          f"client latency p50 {pct(0.5):.2f} ms, p90 {pct(0.9):.2f} ms, p99 {pct(0.99):.2f} ms")
+    with urllib.request.urlopen(url + "/stats") as r:
+        print(json.dumps(json.loads(r.read()), indent=2))
+    for f in failures[:5]:
+        print(f"FAIL: {f}")
+    if httpd is not None:
+        httpd.shutdown()
+        httpd.server_close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+"""
+Cold-start benchmark for the CLI.
+
+    python bench_startup.py                         # table of startup times
+    python bench_startup.py --save a.json
+    python bench_startup.py --compare a.json b.json
+
+Each case runs `python gradient_text_cli.py ...` as a fresh process (against a
+scratch presets/cache folder) and reports the median and best wall time, and the
+overhead over a bare `python -c pass`. The run fails if a case imports a module it
+has no use for (NumPy for a tiny job, the batch/serve machinery for one render,
+the renderer for --help), since that is how startup time creeps back.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Sequence
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gradient_text_cli.py")
+RENDER = ["--text", "play.example.com", "--colors", "#3B28CC", "#3E7FF5", "#58E2F0", "--frames", "48"]
+
+# Modules no single render (or --help) should ever import
+HEAVY = [
+    "numpy",
+    "tkinter",
+    "concurrent.futures",
+    "multiprocessing",
+    "http.server",
+    "gradient_text.batch",
+    "gradient_text.watch",
+    "gradient_text.server",
+    "gradient_text.vectorized",
+]
+RENDERER = ["gradient_text.gradient", "gradient_text.cache", "gradient_text.presets"]
+
+# name -> (arguments after the interpreter, modules that must not be imported)
+CASES: Dict[str, tuple] = {
+    "bare": (["-c", "pass"], []),
+    "import": (["-c", "import gradient_text"], HEAVY + RENDERER),
+    "help": ([CLI, "--help"], HEAVY + RENDERER),
+    "cache-hit": ([CLI] + RENDER, HEAVY),
+    "render": ([CLI] + RENDER + ["--no-cache"], HEAVY),
+}
+
+
+def _run(args: Sequence[str], env: Dict[str, str]) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def imported_modules(args: Sequence[str], env: Dict[str, str]) -> List[str]:
+    """Modules a run imports, from -X importtime's report on stderr."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    names = []
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and line.count("|") == 2:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "package":  # the header row
+                names.append(name)
+    return names
+
+
+def run_cases(runs: int, log) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "APPDATA": tmp}
+        _run(CASES["cache-hit"][0], env)  # fill the cache the cache-hit case reads
+        bare = None
+        for name, (args, banned) in CASES.items():
+            _run(args, env)  # warm the OS file cache
+            times = [_run(args, env) for _ in range(runs)]
+            median = statistics.median(times) * 1000
+            if bare is None:
+                bare = median
+            loaded = set(imported_modules(args, env))
+            unwanted = [m for m in banned if m in loaded]
+            row = {
+                "case": name,
+                "median_ms": median,
+                "best_ms": min(times) * 1000,
+                "overhead_ms": median - bare,
+                "modules": len(loaded),
+                "unwanted": unwanted,
+            }
+            results.append(row)
+            log(f"{name:<10} {row['median_ms']:8.1f} ms median  {row['best_ms']:8.1f} ms best  "
+                f"+{row['overhead_ms']:6.1f} ms over bare  {row['modules']:4} modules"
+                + (f"  UNWANTED: {', '.join(unwanted)}" if unwanted else ""))
+    return results
+
+
+def compare(old_path: str, new_path: str, threshold: float, slack_ms: float) -> int:
+    """Return 1 if any case's overhead grew by more than threshold (and slack_ms)."""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = {r["case"]: r for r in json.load(f)["results"]}
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = {r["case"]: r for r in json.load(f)["results"]}
+    regressions = 0
+    for name, row in new.items():
+        if name not in old or name == "bare":
+            continue
+        before, after = old[name]["overhead_ms"], row["overhead_ms"]
+        flag = ""
+        if after > before * (1 + threshold) and after - before > slack_ms:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<10} overhead {before:7.1f} ms -> {after:7.1f} ms{flag}")
+    print(f"{regressions} regressions (threshold {threshold:.0%}, slack {slack_ms:.0f} ms)")
+    return 1 if regressions else 0
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Measure CLI cold-start latency.")
+    p.add_argument("--runs", type=int, default=20, help="Timed runs per case (the median is reported)")
+    p.add_argument("--save", help="Write results as JSON to this file")
+    p.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two saved result files")
+    p.add_argument("--threshold", type=float, default=0.20, help="Overhead growth that counts as a regression in --compare")
+    p.add_argument("--slack-ms", type=float, default=5.0, help="Ignore overhead changes smaller than this in --compare")
+    p.add_argument("--max-overhead-ms", type=float, default=None, help="Fail if any case's overhead over bare Python exceeds this")
+    ns = p.parse_args(argv)
+
+    if ns.compare:
+        return compare(ns.compare[0], ns.compare[1], ns.threshold, ns.slack_ms)
+
+    results = run_cases(max(1, ns.runs), log=print)
+    if ns.save:
+        meta = {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(ns.save, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"Saved {len(results)} results to {ns.save}")
+    failed = [r["case"] for r in results if r["unwanted"]]
+    if ns.max_overhead_ms is not None:
+        failed += [r["case"] for r in results if r["overhead_ms"] > ns.max_overhead_ms]
+    if failed:
+        print(f"FAIL: {', '.join(sorted(set(failed)))}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,300 @@
+"""
+Benchmark suite for the gradient engine and YAML emitter.
+
+    python benchmark.py                     # full sweep, table on stdout
+    python benchmark.py --quick --save a.json
+    python benchmark.py --compare a.json b.json
+
+Each sweep varies one dimension (text length, frame count, stop count, gradient
+tabs) around a 64-char / 1,000-frame / 4-stop / 1-tab baseline and reports
+frames/sec, chars/sec, peak traced memory and output bytes. Rendering cases use
+a non-periodic shift so every frame is actually computed.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from gradient_text import (
+    ColorStop,
+    compile_gradient,
+    frame_set,
+    frames_to_yaml,
+    iter_frames,
+    per_letter_gradient_frames_multi,
+    sample_gradient,
+    write_yaml,
+)
+from gradient_text import vectorized
+
+BASE_TEXT = 64
+BASE_FRAMES = 1000
+BASE_STOPS = 4
+BASE_TABS = 1
+# Irrational-looking shift: no frame repeats, so cycle reuse can't skip work
+SHIFT = 0.0123456789
+
+SWEEPS = {
+    "text": [8, 32, 64, 128, 512],
+    "frames": [1, 100, 1000, 10000, 100000],
+    "stops": [2, 4, 8, 16, 32],
+    "tabs": [1, 2, 5, 10],
+}
+QUICK_SWEEPS = {
+    "text": [8, 64, 512],
+    "frames": [1, 1000, 10000],
+    "stops": [2, 32],
+    "tabs": [1, 10],
+}
+
+
+def make_text(n: int) -> str:
+    src = "play.minenetwork.com | survival | creative | skyblock | minigames "
+    return (src * (n // len(src) + 1))[:n]
+
+
+def make_gradient(num_stops: int, seed: int = 0) -> List[ColorStop]:
+    stops = []
+    for k in range(num_stops):
+        pos = k / (num_stops - 1) if num_stops > 1 else 0.0
+        h = (k * 97 + seed * 31) % 256
+        stops.append(ColorStop(pos, (h, (h * 3 + 40) % 256, (255 - h) % 256)))
+    return stops
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _cur, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak, "result": result}
+
+
+def bench_frames(
+    text_len: int, frames: int, stops: int, tabs: int, engine: str, repeat: int, resolution: Any = None,
+    codes: str = "ampersand", space: str = "rgb",
+) -> Dict[str, Any]:
+    text = make_text(text_len)
+    grads = [compile_gradient(make_gradient(stops, seed=t), space) for t in range(tabs)]
+    m = _measure(
+        lambda: per_letter_gradient_frames_multi(
+            text, grads, frames, shift_per_frame=SHIFT, engine=engine, resolution=resolution, codes=codes
+        ),
+        repeat,
+    )
+    out = m.pop("result")
+    secs = m["seconds"]
+    return {
+        **m,
+        "frames_per_sec": frames / secs if secs else 0.0,
+        "chars_per_sec": frames * text_len / secs if secs else 0.0,
+        "output_bytes": sum(len(f.encode("utf-8")) for f in out),
+    }
+
+
+def bench_frameset(text_len: int, frames: int, stops: int, engine: str, repeat: int) -> Dict[str, Any]:
+    """bench_frames' work kept as a FrameSet; peak memory is the colors it holds, not strings."""
+    text = make_text(text_len)
+    grads = [make_gradient(stops)]
+    m = _measure(lambda: frame_set(text, grads, frames, shift_per_frame=SHIFT, engine=engine), repeat)
+    fs = m.pop("result")
+    secs = m["seconds"]
+    return {
+        **m,
+        "frames_per_sec": frames / secs if secs else 0.0,
+        "chars_per_sec": frames * text_len / secs if secs else 0.0,
+        "output_bytes": sum(len(f.encode("utf-8")) for f in fs),
+    }
+
+
+def bench_yaml(frames: int, text_len: int, repeat: int) -> Dict[str, Any]:
+    text = make_text(text_len)
+    data = per_letter_gradient_frames_multi(text, [make_gradient(4)], frames, shift_per_frame=SHIFT)
+    m = _measure(lambda: frames_to_yaml(data), repeat)
+    y = m.pop("result")
+    secs = m["seconds"]
+    return {**m, "frames_per_sec": frames / secs if secs else 0.0, "output_bytes": len(y.encode("utf-8"))}
+
+
+def bench_stream(frames: int, text_len: int, engine: str, repeat: int) -> Dict[str, Any]:
+    text = make_text(text_len)
+    grads = [make_gradient(4)]
+
+    def run() -> int:
+        sink = _CountingSink()
+        write_yaml(iter_frames(text, grads, frames, shift_per_frame=SHIFT, engine=engine), sink)
+        return sink.size
+
+    m = _measure(run, repeat)
+    size = m.pop("result")
+    secs = m["seconds"]
+    return {**m, "frames_per_sec": frames / secs if secs else 0.0, "output_bytes": size}
+
+
+def bench_sample(stops: int, repeat: int) -> Dict[str, Any]:
+    grad = compile_gradient(make_gradient(stops))
+    ts = [k / 9973 for k in range(10000)]
+
+    def run() -> None:
+        for t in ts:
+            sample_gradient(grad, t)
+
+    m = _measure(run, repeat)
+    m.pop("result")
+    secs = m["seconds"]
+    return {**m, "samples_per_sec": len(ts) / secs if secs else 0.0}
+
+
+class _CountingSink(io.TextIOBase):
+    """Text sink that only counts UTF-8 bytes, so streaming cost excludes disk I/O."""
+
+    def __init__(self) -> None:
+        self.size = 0
+
+    def write(self, s: str) -> int:
+        self.size += len(s.encode("utf-8"))
+        return len(s)
+
+
+def run_suite(quick: bool, engine: str, repeat: int, log: Callable[[str], None]) -> List[Dict[str, Any]]:
+    sweeps = QUICK_SWEEPS if quick else SWEEPS
+    results: List[Dict[str, Any]] = []
+
+    def record(case: str, params: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+        row = {"case": case, "params": params, **metrics}
+        results.append(row)
+        log(_format_row(row))
+
+    engines = [engine]
+    if engine == "all":
+        engines = ["python"] + (["numpy"] if vectorized.HAS_NUMPY else [])
+
+    for eng in engines:
+        for dim, values in sweeps.items():
+            for v in values:
+                p = {"text": BASE_TEXT, "frames": BASE_FRAMES, "stops": BASE_STOPS, "tabs": BASE_TABS, dim: v}
+                # Keep the big-frame cases affordable on the pure-Python engine
+                r = 1 if p["frames"] * p["text"] >= 1_000_000 else repeat
+                metrics = bench_frames(p["text"], p["frames"], p["stops"], p["tabs"], eng, r)
+                record(f"frames/{eng}/{dim}", {**p, "engine": eng}, metrics)
+        for res in (256, 4096):
+            p = {"text": BASE_TEXT, "frames": BASE_FRAMES, "stops": BASE_STOPS, "tabs": BASE_TABS}
+            metrics = bench_frames(p["text"], p["frames"], p["stops"], p["tabs"], eng, repeat, resolution=res)
+            record(f"frames/{eng}/lut", {**p, "engine": eng, "resolution": res}, metrics)
+        for codes in ("minimessage", "legacy"):
+            p = {"text": BASE_TEXT, "frames": BASE_FRAMES, "stops": BASE_STOPS, "tabs": BASE_TABS}
+            metrics = bench_frames(p["text"], p["frames"], p["stops"], p["tabs"], eng, repeat, codes=codes)
+            record(f"frames/{eng}/codes", {**p, "engine": eng, "codes": codes}, metrics)
+        for space in ("linear", "oklab", "hsv"):
+            p = {"text": BASE_TEXT, "frames": BASE_FRAMES, "stops": BASE_STOPS, "tabs": BASE_TABS}
+            metrics = bench_frames(p["text"], p["frames"], p["stops"], p["tabs"], eng, repeat, space=space)
+            record(f"frames/{eng}/space", {**p, "engine": eng, "space": space}, metrics)
+        p = {"text": BASE_TEXT, "frames": BASE_FRAMES, "stops": BASE_STOPS}
+        record(f"frameset/{eng}", {**p, "engine": eng}, bench_frameset(p["text"], p["frames"], p["stops"], eng, repeat))
+        record(f"stream/{eng}", {"text": BASE_TEXT, "frames": 10000, "engine": eng}, bench_stream(10000, BASE_TEXT, eng, 1))
+
+    if len(engines) > 1:
+        base = {e: r for r in results for e in engines
+                if r["case"] == f"frames/{e}/text" and r["params"]["text"] == BASE_TEXT}
+        log(f"numpy speedup at {BASE_FRAMES} frames x {BASE_TEXT} chars: "
+            f"{base['python']['seconds'] / base['numpy']['seconds']:.1f}x")
+
+    for frames in (1000, 10000):
+        record("yaml", {"text": BASE_TEXT, "frames": frames}, bench_yaml(frames, BASE_TEXT, repeat))
+    for stops in (2, 8, 32):
+        record("sample", {"stops": stops}, bench_sample(stops, repeat))
+    return results
+
+
+def case_id(row: Dict[str, Any]) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(row["params"].items()))
+    return f"{row['case']}[{params}]"
+
+
+def _rate(row: Dict[str, Any]) -> float:
+    for key in ("frames_per_sec", "samples_per_sec"):
+        if key in row:
+            return row[key]
+    return 0.0
+
+
+def _format_row(row: Dict[str, Any]) -> str:
+    parts = [f"{case_id(row):<70}", f"{row['seconds'] * 1000:10.2f} ms"]
+    if "frames_per_sec" in row:
+        parts.append(f"{row['frames_per_sec']:12.0f} frames/s")
+    if "chars_per_sec" in row:
+        parts.append(f"{row['chars_per_sec']:12.0f} chars/s")
+    if "samples_per_sec" in row:
+        parts.append(f"{row['samples_per_sec']:12.0f} samples/s")
+    parts.append(f"{row['peak_bytes'] / 1024:10.1f} KiB peak")
+    if "output_bytes" in row:
+        parts.append(f"{row['output_bytes']:>10} B out")
+    return "  ".join(parts)
+
+
+def compare(old_path: str, new_path: str, threshold: float) -> int:
+    """Print per-case throughput ratios; return 1 if any case slowed down by more than threshold."""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = {case_id(r): r for r in json.load(f)["results"]}
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = {case_id(r): r for r in json.load(f)["results"]}
+    regressions = 0
+    for cid, row in new.items():
+        if cid not in old:
+            continue
+        before, after = _rate(old[cid]), _rate(row)
+        ratio = after / before if before else float("inf")
+        mem = row["peak_bytes"] / old[cid]["peak_bytes"] if old[cid]["peak_bytes"] else float("inf")
+        flag = ""
+        if ratio < 1.0 - threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{cid:<70}  speed x{ratio:6.2f}  memory x{mem:6.2f}{flag}")
+    print(f"{regressions} regressions (threshold {threshold:.0%})")
+    return 1 if regressions else 0
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Benchmark the gradient engine and YAML emitter.")
+    p.add_argument("--quick", action="store_true", help="Fewer points per sweep")
+    p.add_argument("--engine", choices=["auto", "python", "numpy", "all"], default="all", help="Renderer(s) to benchmark")
+    p.add_argument("--repeat", type=int, default=3, help="Timing runs per case (best is kept)")
+    p.add_argument("--save", help="Write results as JSON to this file")
+    p.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two saved result files")
+    p.add_argument("--threshold", type=float, default=0.10, help="Slowdown that counts as a regression in --compare")
+    ns = p.parse_args(argv)
+
+    if ns.compare:
+        return compare(ns.compare[0], ns.compare[1], ns.threshold)
+
+    if ns.engine == "numpy" and not vectorized.HAS_NUMPY:
+        print("Error: numpy is not installed", file=sys.stderr)
+        return 2
+    results = run_suite(ns.quick, ns.engine, max(1, ns.repeat), log=print)
+    if ns.save:
+        meta = {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "numpy": vectorized.np.__version__ if vectorized.HAS_NUMPY else None,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(ns.save, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"Saved {len(results)} results to {ns.save}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+"""
+Randomized check of formatting-code rendering (formatting=True).
+
+    python check_formatting.py                  # 1500 random texts
+    python check_formatting.py --trials 200 --seed 7
+
+Renders random texts mixing '&'/'§' formatting codes, spaces and characters the
+code styles must escape, for every registered code style, compact on and off,
+exact sampling and lookup tables (including a coarse one), and both engines (NumPy only when installed).
+Each frame is read back by a small interpreter that follows Minecraft's rules (a
+legacy color code turns formatting off, a reset clears color and formatting) and
+must show the same text as split_formatting(), with every glyph in the formats
+that were active at it and every visible glyph in the color frame_colors() gives.
+Exits non-zero on the first mismatch.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from typing import FrozenSet, List, Optional, Tuple
+
+from gradient_text.emitters import STYLES, CodeStyle
+from gradient_text.formatting import split_formatting
+from gradient_text.gradient import frame_colors, iter_frames, render_frame, rgb_to_hex
+from gradient_text.jobs import stops_from_colors
+
+GRADIENTS = [
+    stops_from_colors(["#FF0000", "#00FF00", "#0000FF"]),
+    stops_from_colors(["#123456", "#FEDCBA"]),
+    # Runs of equal colors, where compact output leaves codes out
+    stops_from_colors(["#55FF55", "#55FF55"]),
+]
+# Text characters, including ones a style escapes and '%' (the template's format char)
+ALPHABET = "ab<\\%xyz"
+
+Glyph = Tuple[str, Optional[str], FrozenSet[str]]
+
+
+def interpret(frame: str, style: CodeStyle) -> List[Glyph]:
+    """(glyph, color hex or None, active format letters) for each glyph a client would show."""
+    formats = dict(style.formats)
+    reset = formats["r"]
+    out: List[Glyph] = []
+    color: Optional[str] = None
+    active: List[str] = []
+    i, n = 0, len(frame)
+    code_len = len(style.head) + 6 * (len(style.digit_prefix) + 1) + len(style.tail)
+    while i < n:
+        for ch, rep in style.escapes:
+            if frame.startswith(rep, i):
+                out.append((ch, color, frozenset(active)))
+                i += len(rep)
+                break
+        else:
+            if frame.startswith(style.head, i) and frame.startswith(style.tail, i + code_len - len(style.tail)):
+                digits = frame[i + len(style.head):i + code_len - len(style.tail)]
+                color = digits[len(style.digit_prefix)::len(style.digit_prefix) + 1]
+                if style.color_resets_formats:
+                    active = []
+                i += code_len
+                continue
+            if frame.startswith(reset, i):
+                color, active = None, []
+                i += len(reset)
+                continue
+            for letter, code in formats.items():
+                if letter != "r" and frame.startswith(code, i):
+                    active.append(letter)
+                    i += len(code)
+                    break
+            else:
+                out.append((frame[i], color, frozenset(active)))
+                i += 1
+    return out
+
+
+def random_text(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 14)):
+        r = rng.random()
+        if r < 0.3:
+            parts.append(rng.choice("&§") + rng.choice("klmnorLR"))
+        elif r < 0.45:
+            parts.append(" ")
+        else:
+            parts.append(rng.choice(ALPHABET))
+    return "".join(parts)
+
+
+def check_text(text: str, rng: random.Random, engines: List[str]) -> Optional[str]:
+    """None if text renders correctly in every combination, else a description of the first failure."""
+    glyphs, active = split_formatting(text)
+    num_frames = rng.choice([1, 3, 10])
+    resolution = rng.choice([None, "auto", 64, 4])
+    shift = rng.choice([None, 0.0713])
+    expected = [
+        [rgb_to_hex(rgb) for rgb in frame_colors(text, GRADIENTS, f, num_frames, "wrap", shift, resolution, formatting=True)]
+        for f in range(num_frames)
+    ]
+    for style in STYLES.values():
+        if not style.formats:
+            continue
+        for engine in engines:
+            full = None
+            for compact in (False, True):
+                frames = list(
+                    iter_frames(text, GRADIENTS, num_frames, "wrap", shift, engine, compact, resolution, style, formatting=True)
+                )
+                where = f"text={text!r} codes={style.name} engine={engine} compact={compact} resolution={resolution}"
+                for f, frame in enumerate(frames):
+                    seen = interpret(frame, style)
+                    if "".join(g for g, _, _ in seen) != glyphs:
+                        return f"{where} frame {f}: shows {''.join(g for g, _, _ in seen)!r}, want {glyphs!r}"
+                    for k, ((g, color, fmts), want, act) in enumerate(zip(seen, expected[f], active)):
+                        if fmts != frozenset(act):
+                            return f"{where} frame {f} glyph {k}: formats {sorted(fmts)}, want {sorted(act)}"
+                        if not g.isspace() and color != want:
+                            return f"{where} frame {f} glyph {k}: color {color}, want {want}"
+                if compact:
+                    if len("".join(frames)) > len("".join(full)):
+                        return f"{where}: compact output is longer than full output"
+                else:
+                    full = frames
+                    if engine == "python":
+                        single = [
+                            render_frame(text, GRADIENTS, f, num_frames, "wrap", shift, False, resolution, style, formatting=True)
+                            for f in range(num_frames)
+                        ]
+                        if single != frames:
+                            return f"{where}: render_frame disagrees with iter_frames"
+    return None
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Check formatting-code output against a Minecraft-rule interpreter.")
+    p.add_argument("--trials", type=int, default=1500, help="Random texts to check")
+    p.add_argument("--seed", type=int, default=3, help="Random seed")
+    ns = p.parse_args(argv)
+
+    engines = ["python"]
+    try:
+        import numpy  # noqa: F401
+
+        engines.append("numpy")
+    except ImportError:
+        print("numpy not installed: checking the Python engine only", file=sys.stderr)
+    rng = random.Random(ns.seed)
+    for _ in range(ns.trials):
+        error = check_text(random_text(rng), rng, engines)
+        if error:
+            print(f"FAIL: {error}", file=sys.stderr)
+            return 1
+    styles = [s.name for s in STYLES.values() if s.formats]
+    print(f"OK: {ns.trials} texts x {len(styles)} styles ({', '.join(styles)}) x {len(engines)} engine(s) x compact on/off")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,21 +1,75 @@
-from .gradient import (
-    ColorStop,
-    hex_to_rgb,
-    rgb_to_hex,
-    normalize_stops,
-    sample_gradient,
-    per_letter_gradient_frames,
-    per_letter_gradient_frames_multi,
-    frames_to_yaml,
-)
-
-__all__ = [
-    "ColorStop",
-    "hex_to_rgb",
-    "rgb_to_hex",
-    "normalize_stops",
-    "sample_gradient",
-    "per_letter_gradient_frames",
-    "per_letter_gradient_frames_multi",
-    "frames_to_yaml",
-]
+from __future__ import annotations
+
+# Not typing.TYPE_CHECKING: importing typing would cost more than the rest of this module
+TYPE_CHECKING = False
+
+# Public name -> submodule defining it. Submodules are imported on first attribute
+# access (PEP 562), so `import gradient_text` and the CLI only load what they use.
+_LAZY = {
+    "ColorStop": "gradient",
+    "CompiledGradient": "gradient",
+    "compile_gradient": "gradient",
+    "hex_to_rgb": "gradient",
+    "rgb_to_hex": "gradient",
+    "normalize_stops": "gradient",
+    "sample_gradient": "gradient",
+    "per_letter_gradient_frames": "gradient",
+    "per_letter_gradient_frames_multi": "gradient",
+    "iter_frames": "gradient",
+    "render_frame": "gradient",
+    "frame_colors": "gradient",
+    "iter_frame_colors": "gradient",
+    "compact_bytes_saved": "gradient",
+    "frames_to_yaml": "gradient",
+    "write_yaml": "gradient",
+    "FrameSet": "frameset",
+    "block_frames": "block",
+    "iter_block_frames": "block",
+    "frame_set": "frameset",
+    "CodeStyle": "emitters",
+    "write_frames": "emitters",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from typing import Any, List
+
+    from .gradient import (
+        ColorStop,
+        CompiledGradient,
+        compile_gradient,
+        hex_to_rgb,
+        rgb_to_hex,
+        normalize_stops,
+        sample_gradient,
+        per_letter_gradient_frames,
+        per_letter_gradient_frames_multi,
+        iter_frames,
+        render_frame,
+        frame_colors,
+        iter_frame_colors,
+        compact_bytes_saved,
+        frames_to_yaml,
+        write_yaml,
+    )
+    from .emitters import CodeStyle, write_frames
+    from .block import block_frames, iter_block_frames
+    from .frameset import FrameSet, frame_set
@@ -1,17 +1,56 @@
 from __future__ import annotations
 
+import queue
+import threading
+import time
+from collections import deque
 import tkinter as tk
 from tkinter import ttk, colorchooser, messagebox, filedialog
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Any, Tuple
 
 from .gradient import (
     ColorStop,
-    per_letter_gradient_frames_multi,
-    frames_to_yaml,
+    CompiledGradient,
+    compile_gradient,
+    frame_colors,
+    iter_frame_colors,
+    iter_frames,
+    write_yaml,
 )
 from . import gradient as gradient_core
 from . import presets as presets_mgr
+from .colorspace import SPACES
+from .formatting import split_formatting
+from .segment import grapheme_clusters
+
+
+class _QueueWriter:
+    """File-like sink for write_yaml that hands text to the GUI thread in chunks."""
+
+    CHUNK_CHARS = 64 * 1024
+
+    def __init__(self, out: "queue.Queue[tuple]"):
+        self._out = out
+        self._parts: List[str] = []
+        self._size = 0
+
+    def write(self, s: str) -> int:
+        self._parts.append(s)
+        self._size += len(s)
+        if self._size >= self.CHUNK_CHARS:
+            self.flush()
+        return len(s)
+
+    def flush(self) -> None:
+        if self._parts:
+            self._out.put(("text", "".join(self._parts)))
+            self._parts = []
+            self._size = 0
+
+
+class _Cancelled(Exception):
+    pass
 
 
 @dataclass
@@ -34,6 +73,9 @@ class GradientTextApp(ttk.Frame):
         self.frames_var = tk.IntVar(value=48)
         self.interval_var = tk.IntVar(value=200)
         self.shift_mode_var = tk.StringVar(value="wrap")
+        self.space_var = tk.StringVar(value="rgb")
+        self.formatting_var = tk.BooleanVar(value=False)
+        self.graphemes_var = tk.BooleanVar(value=False)
         self.shift_per_frame_var = tk.StringVar(value="")  # empty means auto
         self.root_key_var = tk.StringVar(value="web")
         self.list_key_var = tk.StringVar(value="texts")
@@ -47,6 +89,27 @@ class GradientTextApp(ttk.Frame):
         # Presets
         self.preset_combo_var = tk.StringVar()
 
+        # Background YAML generation
+        self._gen_thread: Optional[threading.Thread] = None
+        self._gen_cancel = threading.Event()
+        self._gen_queue: "queue.Queue[tuple]" = queue.Queue()
+        self._gen_on_done: Optional[Callable[[], None]] = None
+        self._gen_id = 0
+
+        # Pending debounced preview redraw (after() id)
+        self._preview_after: Optional[str] = None
+        # Preview text tags, one per color ('#rrggbb' -> tag name), reused across redraws
+        self._color_tags: Dict[str, str] = {}
+
+        # Playback: frames are prepared ahead of the display into a small ring buffer
+        self._playing = False
+        self._play_after: Optional[str] = None
+        self._play_buffer: Deque[Tuple[int, Dict[str, List[str]]]] = deque(maxlen=self.PLAY_AHEAD)
+        self._play_source: Optional[Iterator[Tuple[int, Dict[str, List[str]]]]] = None
+        self._play_due = 0.0
+        self._play_last_shown: Optional[float] = None
+        self._play_frame_ms: Optional[float] = None
+
         self._build_ui()
         self._add_default_tabs()
         self._update_preview()
@@ -81,6 +144,10 @@ class GradientTextApp(ttk.Frame):
         ttk.Entry(controls, textvariable=self.root_key_var, width=12).grid(row=2, column=1, sticky="w", padx=4, pady=4)
         ttk.Label(controls, text="List key:").grid(row=2, column=2, sticky="w", padx=4, pady=4)
         ttk.Entry(controls, textvariable=self.list_key_var, width=12).grid(row=2, column=3, sticky="w", padx=4, pady=4)
+        ttk.Label(controls, text="Blend in:").grid(row=2, column=4, sticky="w", padx=4, pady=4)
+        ttk.Combobox(controls, values=list(SPACES), textvariable=self.space_var, state="readonly", width=10).grid(row=2, column=5, sticky="w", padx=4, pady=4)
+        ttk.Checkbutton(controls, text="Formatting codes (&l, &o, &r ...)", variable=self.formatting_var).grid(row=2, column=6, columnspan=2, sticky="w", padx=4, pady=4)
+        ttk.Checkbutton(controls, text="Grapheme clusters", variable=self.graphemes_var).grid(row=2, column=8, sticky="w", padx=4, pady=4)
 
         # Presets row
         presets_row = ttk.LabelFrame(self, text="Presets")
@@ -124,6 +191,10 @@ class GradientTextApp(ttk.Frame):
         self.frame_slider.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=8)
         self.frame_label = ttk.Label(slider_row, text="0/0")
         self.frame_label.pack(side=tk.LEFT)
+        self.play_btn = ttk.Button(slider_row, text="Play", width=6, command=self._on_play_pause)
+        self.play_btn.pack(side=tk.LEFT, padx=(8, 4))
+        self.play_stats = ttk.Label(slider_row, text="", width=24)
+        self.play_stats.pack(side=tk.LEFT)
 
         # YAML output box
         yaml_box = ttk.LabelFrame(self, text="YAML output")
@@ -133,12 +204,19 @@ class GradientTextApp(ttk.Frame):
 
         out_btns = ttk.Frame(self)
         out_btns.pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=8)
-        ttk.Button(out_btns, text="Generate YAML", command=self._on_generate_yaml).pack(side=tk.LEFT, padx=4)
+        self.generate_btn = ttk.Button(out_btns, text="Generate YAML", command=self._on_generate_yaml)
+        self.generate_btn.pack(side=tk.LEFT, padx=4)
+        self.cancel_btn = ttk.Button(out_btns, text="Cancel", command=self._on_cancel_generate, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=4)
         ttk.Button(out_btns, text="Copy YAML", command=self._on_copy_yaml).pack(side=tk.LEFT, padx=4)
         ttk.Button(out_btns, text="Save YAML...", command=self._on_save_yaml).pack(side=tk.LEFT, padx=4)
+        self.gen_progress = ttk.Progressbar(out_btns, orient=tk.HORIZONTAL, length=240, mode="determinate")
+        self.gen_progress.pack(side=tk.LEFT, padx=8)
+        self.gen_status = ttk.Label(out_btns, text="")
+        self.gen_status.pack(side=tk.LEFT, padx=4)
 
         # Bind changes to update preview
-        for var in [self.text_var, self.shift_mode_var, self.shift_per_frame_var, self.root_key_var, self.list_key_var]:
+        for var in [self.text_var, self.shift_mode_var, self.space_var, self.formatting_var, self.graphemes_var, self.shift_per_frame_var, self.root_key_var, self.list_key_var]:
             var.trace_add("write", self._trace_update_preview)
         for var in [self.frames_var, self.interval_var]:
             var.trace_add("write", self._trace_update_frame_slider)
@@ -148,7 +226,7 @@ class GradientTextApp(ttk.Frame):
         self.notebook.bind("<<NotebookTabChanged>>", lambda _e: self._update_preview())
 
     def _trace_update_preview(self, *_args):
-        self._update_preview()
+        self._schedule_preview()
         return ""
 
     def _trace_update_frame_slider(self, *_args):
@@ -339,6 +417,13 @@ class GradientTextApp(ttk.Frame):
             return None
         return v
 
+    def _compile_all_gradients(self) -> List[CompiledGradient]:
+        gradients = self._collect_all_gradients()
+        if not gradients:
+            gradients = [[]]
+        # Non-rgb spaces are converted once here; preview, playback and generation reuse the tables
+        return [compile_gradient(stops, self.space_var.get()) for stops in gradients]
+
     # Presets
     def _refresh_preset_list(self):
         names = presets_mgr.list_preset_names()
@@ -430,6 +515,9 @@ class GradientTextApp(ttk.Frame):
             "shift_per_frame": float(self.shift_per_frame_var.get()) if self.shift_per_frame_var.get().strip() else None,
             "root_key": self.root_key_var.get(),
             "list_key": self.list_key_var.get(),
+            "space": self.space_var.get(),
+            "formatting": bool(self.formatting_var.get()),
+            "graphemes": bool(self.graphemes_var.get()),
             "gradients": gradients,
         }
 
@@ -443,6 +531,9 @@ class GradientTextApp(ttk.Frame):
         self.shift_per_frame_var.set("" if spf is None else str(spf))
         self.root_key_var.set(data.get("root_key", self.root_key_var.get()))
         self.list_key_var.set(data.get("list_key", self.list_key_var.get()))
+        self.space_var.set(data.get("space", "rgb"))
+        self.formatting_var.set(bool(data.get("formatting", False)))
+        self.graphemes_var.set(bool(data.get("graphemes", False)))
         # Gradients
         grads = data.get("gradients", [])[: self.MAX_GRADIENTS]
         # Clear notebook
@@ -467,10 +558,28 @@ class GradientTextApp(ttk.Frame):
         self._update_preview()
 
     # Preview
-    def _on_slider(self, _evt=None):
-        self.preview_frame_index.set(int(round(self.frame_slider.get())))
+    # Keystrokes and slider drags arrive in bursts; coalesce them into one redraw
+    # PREVIEW_DELAY_MS after the last event.
+    PREVIEW_DELAY_MS = 60
+
+    def _schedule_preview(self):
+        if self._preview_after is not None:
+            self.after_cancel(self._preview_after)
+        self._preview_after = self.after(self.PREVIEW_DELAY_MS, self._run_scheduled_preview)
+
+    def _run_scheduled_preview(self):
+        self._preview_after = None
         self._update_preview()
 
+    def _on_slider(self, _evt=None):
+        total = max(1, self.frames_var.get())
+        cur = min(int(round(self.frame_slider.get())), total - 1)
+        if self._playing and cur == self.preview_frame_index.get():
+            return  # playback moved the slider itself
+        self.preview_frame_index.set(cur)
+        self.frame_label.configure(text=f"{cur+1}/{total}")
+        self._schedule_preview()
+
     def _update_frame_slider(self):
         total = max(1, self.frames_var.get())
         self.frame_slider.configure(from_=0, to=total - 1)
@@ -478,74 +587,207 @@ class GradientTextApp(ttk.Frame):
         self.preview_frame_index.set(cur)
         self.frame_slider.set(cur)
         self.frame_label.configure(text=f"{cur+1}/{total}")
-        self._update_preview()
+        self._schedule_preview()
+
+    # Tk keeps every tag's configuration until it is deleted; past this many pooled
+    # colors the pool is dropped and rebuilt so a long session can't grow it forever.
+    MAX_COLOR_TAGS = 4096
 
     def _update_preview(self):
+        # Any settings change invalidates frames playback has already prepared
+        self._play_buffer.clear()
+        self._play_source = None
         try:
             text = self.text_var.get()
-            gradients = self._collect_all_gradients()
-            if not gradients:
-                gradients = [[]]
-            frames = per_letter_gradient_frames_multi(
+            gradients = self._compile_all_gradients()
+            num_frames = max(1, self.frames_var.get())
+            # Only the frame on screen is rendered, whatever the frame count
+            colors = frame_colors(
                 text=text,
                 stops_list=gradients,
-                num_frames=max(1, self.frames_var.get()),
+                index=min(self.preview_frame_index.get(), num_frames - 1),
+                num_frames=num_frames,
                 shift_mode=self.shift_mode_var.get(),
                 shift_per_frame=self._get_shift_per_frame(),
+                formatting=self.formatting_var.get(),
+                graphemes=self.graphemes_var.get(),
             )
-            idx = min(self.preview_frame_index.get(), len(frames) - 1)
-            frame = frames[idx]
-            # Render colored text
-            self.preview_text.configure(state=tk.NORMAL)
-            self.preview_text.delete("1.0", tk.END)
-            # Parse '&#RRGGBB<char>' segments and create tags
-            i = 0
-            out_chars = []
-            colors = []
-            while i < len(frame):
-                if frame[i:i+2] == "&#":
-                    hexcode = frame[i+2:i+8]
-                    ch = frame[i+8:i+9]
-                    if len(hexcode) == 6 and len(ch) == 1:
-                        out_chars.append(ch)
-                        colors.append(f"#{hexcode}")
-                        i += 9
-                        continue
-                # Fallback, shouldn't happen
-                out_chars.append(frame[i])
-                colors.append("#FFFFFF")
-                i += 1
-            self.preview_text.insert("1.0", "".join(out_chars))
-            # Apply tags
-            for idx2, color in enumerate(colors):
-                tag = f"c{idx2}"
-                self.preview_text.tag_add(tag, f"1.{idx2}", f"1.{idx2+1}")
-                self.preview_text.tag_config(tag, foreground=color)
-            self.preview_text.configure(state=tk.DISABLED)
+            self._show_preview(self._preview_text(), self._color_ranges(self._char_colors(colors)))
         except Exception as e:
             # Non-fatal
+            self._stop_playback()
             self.preview_text.configure(state=tk.NORMAL)
             self.preview_text.delete("1.0", tk.END)
             self.preview_text.insert("1.0", f"Preview error: {e}")
             self.preview_text.configure(state=tk.DISABLED)
 
+    def _preview_text(self) -> str:
+        """The text as displayed: formatting codes are not shown, only their glyphs."""
+        text = self.text_var.get()
+        return split_formatting(text)[0] if self.formatting_var.get() else text
+
+    def _char_colors(self, colors: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+        """Per-character colors for the preview; with grapheme clusters each color covers a whole cluster."""
+        if not self.graphemes_var.get():
+            return colors
+        clusters = grapheme_clusters(self._preview_text())
+        return [rgb for rgb, cluster in zip(colors, clusters) for _ in cluster]
+
+    @staticmethod
+    def _color_ranges(colors: List[Tuple[int, int, int]]) -> Dict[str, List[str]]:
+        """Character ranges grouped by color, so each color costs one tag_add call."""
+        ranges: Dict[str, List[str]] = {}
+        for i, rgb in enumerate(colors):
+            ranges.setdefault(f"#{gradient_core.rgb_to_hex(rgb)}", []).extend((f"1.{i}", f"1.{i + 1}"))
+        return ranges
+
+    def _show_preview(self, text: str, ranges: Dict[str, List[str]]):
+        self.preview_text.configure(state=tk.NORMAL)
+        self.preview_text.delete("1.0", tk.END)
+        self.preview_text.insert("1.0", text)
+        if len(self._color_tags) + len(ranges) > self.MAX_COLOR_TAGS:
+            self._clear_color_tags()
+        for color, indices in ranges.items():
+            self.preview_text.tag_add(self._color_tag(color), *indices)
+        self.preview_text.configure(state=tk.DISABLED)
+
+    def _color_tag(self, color: str) -> str:
+        tag = self._color_tags.get(color)
+        if tag is None:
+            tag = self._color_tags[color] = f"fg{color[1:]}"
+            self.preview_text.tag_configure(tag, foreground=color)
+        return tag
+
+    def _clear_color_tags(self):
+        if self._color_tags:
+            self.preview_text.tag_delete(*self._color_tags.values())
+            self._color_tags.clear()
+
+    # Playback
+    # Each tick shows the next buffered frame, then spends up to half the interval
+    # preparing frames ahead, so slow frames are absorbed by the buffer instead of
+    # stretching the interval.
+    PLAY_AHEAD = 16
+
+    def _on_play_pause(self):
+        if self._playing:
+            self._stop_playback()
+            return
+        self._playing = True
+        self.play_btn.configure(text="Pause")
+        self._play_buffer.clear()
+        self._play_source = None
+        self._play_last_shown = None
+        self._play_frame_ms = None
+        self._play_due = time.perf_counter()
+        self._play_tick()
+
+    def _stop_playback(self):
+        self._playing = False
+        if self._play_after is not None:
+            self.after_cancel(self._play_after)
+            self._play_after = None
+        self._play_buffer.clear()
+        self._play_source = None
+        self.play_btn.configure(text="Play")
+        self.play_stats.configure(text="")
+
+    def _playback_frames(self) -> Iterator[Tuple[int, Dict[str, List[str]]]]:
+        """(index, color ranges) for the frames after the one on screen, looping forever."""
+        text = self.text_var.get()
+        gradients = self._compile_all_gradients()
+        num_frames = max(1, self.frames_var.get())
+        shift_mode = self.shift_mode_var.get()
+        shift_per_frame = self._get_shift_per_frame()
+        formatting = self.formatting_var.get()
+        graphemes = self.graphemes_var.get()
+        start = (self.preview_frame_index.get() + 1) % num_frames
+
+        def frames():
+            first = start
+            while True:
+                colors = iter_frame_colors(
+                    text, gradients, num_frames, shift_mode, shift_per_frame, first=first,
+                    formatting=formatting, graphemes=graphemes,
+                )
+                for index, frame in enumerate(colors, first):
+                    yield index, self._color_ranges(self._char_colors(frame))
+                first = 0
+
+        return frames()
+
+    def _fill_play_buffer(self, deadline: float):
+        if self._play_source is None:
+            self._play_source = self._playback_frames()
+        while len(self._play_buffer) < self.PLAY_AHEAD and time.perf_counter() < deadline:
+            self._play_buffer.append(next(self._play_source))
+
+    def _play_tick(self):
+        self._play_after = None
+        if not self._playing:
+            return
+        target_ms = max(1, self.interval_var.get())
+        try:
+            if not self._play_buffer:
+                # Buffer ran dry (or settings changed): render this frame on the spot
+                if self._play_source is None:
+                    self._play_source = self._playback_frames()
+                self._play_buffer.append(next(self._play_source))
+            index, ranges = self._play_buffer.popleft()
+            self._show_preview(self._preview_text(), ranges)
+        except Exception:
+            self._update_preview()  # shows the error and stops playback
+            return
+
+        now = time.perf_counter()
+        if self._play_last_shown is not None:
+            ms = (now - self._play_last_shown) * 1000
+            # Smoothed so the readout is legible at short intervals
+            self._play_frame_ms = ms if self._play_frame_ms is None else 0.8 * self._play_frame_ms + 0.2 * ms
+        self._play_last_shown = now
+        total = max(1, self.frames_var.get())
+        self.preview_frame_index.set(index)
+        self.frame_slider.set(index)
+        self.frame_label.configure(text=f"{index+1}/{total}")
+        measured = "--" if self._play_frame_ms is None else f"{self._play_frame_ms:.0f}"
+        self.play_stats.configure(text=f"{measured} / {target_ms} ms per frame")
+
+        # Schedule against an ideal timeline; if far behind, restart it rather than bursting
+        self._play_due += target_ms / 1000
+        if self._play_due < now - target_ms / 1000:
+            self._play_due = now + target_ms / 1000
+        self._fill_play_buffer(deadline=now + target_ms / 2000)
+        delay = max(1, int((self._play_due - time.perf_counter()) * 1000))
+        self._play_after = self.after(delay, self._play_tick)
+
     # YAML generation handlers
-    def _on_generate_yaml(self):
+    # Generation runs on a worker thread; the Tk thread polls its queue with after(),
+    # appending YAML to yaml_text as it arrives so the window stays responsive.
+    POLL_MS = 50
+
+    def _on_generate_yaml(self, on_done: Optional[Callable[[], None]] = None):
         text = self.text_var.get()
         if not text:
             messagebox.showerror("Error", "Text cannot be empty")
             return
+        if self._gen_thread is not None:
+            self._on_cancel_generate()
+            self._gen_thread.join()
+            self._drain_generation_queue()
         try:
-            gradients = self._collect_all_gradients()
-            frames = per_letter_gradient_frames_multi(
+            # Read every Tk variable here: the worker must not touch widgets or variables.
+            gradients = self._compile_all_gradients()
+            num_frames = max(1, self.frames_var.get())
+            frames = iter_frames(
                 text=text,
                 stops_list=gradients,
-                num_frames=max(1, self.frames_var.get()),
+                num_frames=num_frames,
                 shift_mode=self.shift_mode_var.get(),
                 shift_per_frame=self._get_shift_per_frame(),
+                formatting=self.formatting_var.get(),
+                graphemes=self.graphemes_var.get(),
             )
-            y = frames_to_yaml(
-                frames,
+            yaml_opts = dict(
                 change_interval_ms=max(1, self.interval_var.get()),
                 root_key=self.root_key_var.get() or "web",
                 list_key=self.list_key_var.get() or "texts",
@@ -554,23 +796,114 @@ class GradientTextApp(ttk.Frame):
             messagebox.showerror("Error", f"Failed to generate: {e}")
             return
         self.yaml_text.delete("1.0", tk.END)
-        self.yaml_text.insert("1.0", y)
+        self.gen_progress.configure(maximum=num_frames, value=0)
+        self.gen_status.configure(text=f"0/{num_frames}")
+        self.generate_btn.configure(state=tk.DISABLED)
+        self.cancel_btn.configure(state=tk.NORMAL)
+        self._gen_cancel = threading.Event()
+        self._gen_queue = queue.Queue()
+        self._gen_on_done = on_done
+        self._gen_id += 1
+        self._gen_thread = threading.Thread(
+            target=self._generation_worker,
+            args=(frames, yaml_opts, self._gen_cancel, self._gen_queue),
+            daemon=True,
+        )
+        self._gen_thread.start()
+        self.after(self.POLL_MS, self._poll_generation, self._gen_id)
+
+    @staticmethod
+    def _generation_worker(frames, yaml_opts: Dict[str, Any], cancel: threading.Event, out: "queue.Queue[tuple]"):
+        def checked():
+            for i, frame in enumerate(frames):
+                if cancel.is_set():
+                    raise _Cancelled
+                yield frame
+                if i % 64 == 63:
+                    out.put(("progress", i + 1))
+
+        writer = _QueueWriter(out)
+        try:
+            count = write_yaml(checked(), writer, **yaml_opts)
+            writer.flush()
+            out.put(("done", count))
+        except _Cancelled:
+            writer.flush()
+            out.put(("cancelled", None))
+        except Exception as e:
+            out.put(("error", str(e)))
+
+    def _drain_generation_queue(self) -> Optional[tuple]:
+        """Apply queued worker output; returns the final ('done'/'cancelled'/'error', ...) message if seen."""
+        final = None
+        while True:
+            try:
+                msg = self._gen_queue.get_nowait()
+            except queue.Empty:
+                return final
+            kind, payload = msg
+            if kind == "text":
+                self.yaml_text.insert(tk.END, payload)
+            elif kind == "progress":
+                self.gen_progress.configure(value=payload)
+                self.gen_status.configure(text=f"{payload}/{int(self.gen_progress.cget('maximum'))}")
+            else:
+                final = msg
+
+    def _poll_generation(self, gen_id: int):
+        if gen_id != self._gen_id:
+            return  # superseded by a newer generation, which has its own poll loop
+        final = self._drain_generation_queue()
+        if final is None:
+            if self._gen_thread is not None:
+                self.after(self.POLL_MS, self._poll_generation, gen_id)
+            return
+        self._gen_thread = None
+        self.generate_btn.configure(state=tk.NORMAL)
+        self.cancel_btn.configure(state=tk.DISABLED)
+        kind, payload = final
+        on_done, self._gen_on_done = self._gen_on_done, None
+        if kind == "done":
+            self.gen_progress.configure(value=payload)
+            self.gen_status.configure(text=f"Generated {payload} frames")
+            if on_done is not None:
+                on_done()
+        elif kind == "cancelled":
+            # Don't leave truncated YAML around to be copied or saved by mistake
+            self.yaml_text.delete("1.0", tk.END)
+            self.gen_status.configure(text="Cancelled")
+        else:
+            self.gen_status.configure(text="Failed")
+            messagebox.showerror("Error", f"Failed to generate: {payload}")
+
+    def _on_cancel_generate(self):
+        self._gen_cancel.set()
+
+    def _generation_running(self) -> bool:
+        if self._gen_thread is not None:
+            messagebox.showinfo("Generating", "YAML generation is still running; wait for it to finish or cancel it.")
+            return True
+        return False
 
     def _on_copy_yaml(self):
+        if self._generation_running():
+            return
         data = self.yaml_text.get("1.0", tk.END)
         if not data.strip():
-            self._on_generate_yaml()
-            data = self.yaml_text.get("1.0", tk.END)
+            self._on_generate_yaml(on_done=self._on_copy_yaml)
+            return
         self.clipboard_clear()
         self.clipboard_append(data)
         self.update()
         messagebox.showinfo("Copied", "YAML copied to clipboard.")
 
     def _on_save_yaml(self):
+        if self._generation_running():
+            return
         data = self.yaml_text.get("1.0", tk.END)
         if not data.strip():
-            self._on_generate_yaml()
-            data = self.yaml_text.get("1.0", tk.END)
+            self._on_generate_yaml(on_done=self._on_save_yaml)
+            return
         path = filedialog.asksaveasfilename(defaultextension=".yml", filetypes=[("YAML", "*.yml;*.yaml"), ("All files", "*.*")])
         if not path:
             return
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from . import cache as render_cache
+from . import presets as presets_mgr
+from .emitters import EXTENSIONS
+from .jobs import RenderJob, RenderResult, render_job
+
+
+# Manifest entry keys that describe the job itself rather than the render spec
+_META_KEYS = ("name", "preset", "out")
+
+# Per out-dir record of the spec each output was last rendered from, for skip_unchanged
+STAMPS_FILE = ".gradient_text_stamps.json"
+
+
+@dataclass
+class BatchResult:
+    name: str
+    out: str
+    ok: bool
+    seconds: float
+    lines: int = 0
+    cached: bool = False
+    skipped: bool = False  # output already up to date (skip_unchanged)
+    error: str = ""
+
+
+def parse_manifest(text: str) -> List[Dict[str, Any]]:
+    """
+    Parse a batch manifest. Accepted forms:
+      - a JSON list of jobs, or an object with a "jobs" list
+      - one job per line: a JSON object, or a bare preset name
+    Blank lines and lines starting with '#' are ignored. A job is a preset-style dict
+    with optional "name", "preset" (base preset to start from) and "out" keys.
+    """
+    s = text.strip()
+    if not s:
+        return []
+    if s[0] in "[{":
+        try:
+            data = json.loads(s)
+        except json.JSONDecodeError:
+            data = None  # probably one JSON object per line
+        if isinstance(data, list):
+            return [_entry(item) for item in data]
+        if isinstance(data, dict):
+            return [_entry(item) for item in data["jobs"]] if "jobs" in data else [data]
+    entries: List[Dict[str, Any]] = []
+    for line in s.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        entries.append(_entry(json.loads(line) if line.startswith("{") else line))
+    return entries
+
+
+def _entry(item: Any) -> Dict[str, Any]:
+    if isinstance(item, str):
+        return {"preset": item}
+    if not isinstance(item, dict):
+        raise ValueError(f"manifest job must be an object or preset name, got {item!r}")
+    return item
+
+
+def preset_entries(pattern: str = "*", **overrides: Any) -> List[Dict[str, Any]]:
+    """
+    Manifest entries for every saved preset whose name matches the glob `pattern`,
+    read in one pass over the preset store. `overrides` are applied to each spec.
+    """
+    presets = presets_mgr.load_presets().get("presets", {})
+    return [
+        {**spec, **overrides, "name": name}
+        for name, spec in sorted(presets.items())
+        if fnmatch.fnmatchcase(name, pattern)
+    ]
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "job"
+
+
+def _plan(entries: List[Dict[str, Any]], out_dir: str) -> List[tuple]:
+    """Resolve names, output paths and preset bases for every entry."""
+    used: Dict[str, int] = {}
+    plan = []
+    for i, entry in enumerate(entries):
+        name = str(entry.get("name") or entry.get("preset") or f"job{i + 1}")
+        out = entry.get("out")
+        if not out:
+            stem = _safe_name(name)
+            used[stem] = used.get(stem, 0) + 1
+            if used[stem] > 1:
+                stem = f"{stem}-{used[stem]}"
+            out = os.path.join(out_dir, stem + EXTENSIONS.get(str(entry.get("format", "yaml")), ".txt"))
+        spec = {k: v for k, v in entry.items() if k not in _META_KEYS}
+        error = ""
+        preset_name = entry.get("preset")
+        if preset_name:
+            base = presets_mgr.get_preset(preset_name)
+            if base:
+                spec = {**base, **spec}
+            else:
+                error = f"preset '{preset_name}' not found"
+        plan.append((name, str(out), spec, error))
+    return plan
+
+
+def render_to_file(
+    job: RenderJob,
+    out: str,
+    use_cache: bool = True,
+    engine: str = "auto",
+    max_bytes: int = render_cache.DEFAULT_MAX_BYTES,
+) -> RenderResult:
+    """Render job to the file `out`, which is replaced atomically (readers never see a partial file)."""
+    parent = os.path.dirname(out)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    tmp = f"{out}.tmp{os.getpid()}"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            result = render_job(job, f, use_cache=use_cache, engine=engine, max_bytes=max_bytes)
+        os.replace(tmp, out)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return result
+
+
+def _run_job(
+    name: str,
+    out: str,
+    spec: Dict[str, Any],
+    use_cache: bool,
+    engine: str,
+    max_bytes: int,
+) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        job = RenderJob.from_dict(spec, what=name)
+        result = render_to_file(job, out, use_cache=use_cache, engine=engine, max_bytes=max_bytes)
+    except Exception as e:
+        return BatchResult(name=name, out=out, ok=False, seconds=time.perf_counter() - start, error=str(e))
+    return BatchResult(
+        name=name,
+        out=out,
+        ok=True,
+        seconds=time.perf_counter() - start,
+        lines=result.lines,
+        cached=result.cached,
+    )
+
+
+def run_batch(
+    entries: List[Dict[str, Any]],
+    out_dir: str = ".",
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+    engine: str = "auto",
+    max_bytes: int = render_cache.DEFAULT_MAX_BYTES,
+    skip_unchanged: bool = False,
+) -> List[BatchResult]:
+    """
+    Render every manifest entry to its own file, spreading jobs over a process pool
+    of `workers` processes (default: CPU count). Results are in manifest order;
+    a failing job is reported in its result and does not stop the others.
+
+    With skip_unchanged, a job is not run when its output file is still the one
+    this function last wrote for the same spec (see STAMPS_FILE in out_dir).
+    """
+    plan = _plan(entries, out_dir)
+    results: List[Optional[BatchResult]] = [None] * len(plan)
+    stamps = _load_stamps(out_dir) if skip_unchanged else {}
+    keys: Dict[int, str] = {}
+    todo = []
+    for i, (name, out, spec, error) in enumerate(plan):
+        if error:
+            results[i] = BatchResult(name=name, out=out, ok=False, seconds=0.0, error=error)
+            continue
+        if skip_unchanged:
+            try:
+                keys[i] = RenderJob.from_dict(spec, what=name).cache_key()
+            except Exception:
+                pass  # invalid spec (any error, as in _run_job): let the job report it
+            if i in keys and stamps.get(os.path.abspath(out)) == [keys[i], *_file_stamp(out)]:
+                results[i] = BatchResult(name=name, out=out, ok=True, seconds=0.0, skipped=True)
+                continue
+        todo.append(i)
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1 or len(todo) <= 1:
+        for i in todo:
+            name, out, spec, _ = plan[i]
+            results[i] = _run_job(name, out, spec, use_cache, engine, max_bytes)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            futures = {}
+            for i in todo:
+                name, out, spec, _ = plan[i]
+                futures[i] = pool.submit(_run_job, name, out, spec, use_cache, engine, max_bytes)
+            for i, fut in futures.items():
+                try:
+                    results[i] = fut.result()
+                except Exception as e:  # worker process died
+                    name, out, _spec, _ = plan[i]
+                    results[i] = BatchResult(name=name, out=out, ok=False, seconds=0.0, error=str(e))
+    if skip_unchanged:
+        for i in todo:
+            result = results[i]
+            if result is not None and result.ok and i in keys:
+                stamps[os.path.abspath(result.out)] = [keys[i], *_file_stamp(result.out)]
+        _save_stamps(out_dir, stamps)
+    return [r for r in results if r is not None]
+
+
+def _file_stamp(path: str) -> List[int]:
+    """[size, mtime_ns] of path, or [] if it is missing (never matches a stamp)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return []
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _load_stamps(out_dir: str) -> Dict[str, List[Any]]:
+    try:
+        with open(os.path.join(out_dir, STAMPS_FILE), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_stamps(out_dir: str, stamps: Dict[str, List[Any]]) -> None:
+    os.makedirs(out_dir or ".", exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=out_dir or ".", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(stamps, f, indent=1, sort_keys=True)
+    os.replace(tmp, os.path.join(out_dir, STAMPS_FILE))
+
+
+def format_summary(results: List[BatchResult], wall_seconds: Optional[float] = None) -> str:
+    lines = []
+    width = max([len(r.name) for r in results] + [4])
+    for r in results:
+        if r.skipped:
+            status = "same"
+            detail = f"unchanged -> {r.out}"
+        elif r.ok:
+            status = "cached" if r.cached else "ok"
+            detail = f"{r.lines} lines -> {r.out}"
+        else:
+            status = "FAILED"
+            detail = r.error
+        lines.append(f"{r.name:<{width}}  {status:<6}  {r.seconds * 1000:8.1f} ms  {detail}")
+    failed = sum(1 for r in results if not r.ok)
+    skipped = sum(1 for r in results if r.skipped)
+    total = f"{len(results)} jobs, {len(results) - failed - skipped} ok, {skipped} unchanged, {failed} failed"
+    if wall_seconds is not None:
+        total += f" in {wall_seconds:.2f} s"
+    lines.append(total)
+    return "\n".join(lines)
+
+
+def results_to_json(results: List[BatchResult]) -> str:
+    return json.dumps([asdict(r) for r in results], indent=2)
+
+
+__all__ = [
+    "BatchResult",
+    "STAMPS_FILE",
+    "parse_manifest",
+    "preset_entries",
+    "render_to_file",
+    "run_batch",
+    "format_summary",
+    "results_to_json",
+]
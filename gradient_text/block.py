@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from functools import partial
+from math import gcd
+from typing import TYPE_CHECKING, Iterator, List, Sequence, Tuple
+
+from .emitters import StyleLike, _encoder, get_style
+from .gradient import (
+    GradientLike,
+    _Animation,
+    _build_animation,
+    _iter_color_chunks,
+    _iter_periodic,
+    _render_frame_lut,
+    _render_frame_lut_compact,
+    prefix_table,
+)
+
+if TYPE_CHECKING:
+    from .formatting import StyledText
+
+
+# How a block's characters are placed on the gradient (0..1):
+#   lines     each line spans the whole gradient on its own
+#   columns   position follows the column, so lines stack in aligned color bands
+#   flow      one gradient runs through all lines in reading order
+#   diagonal  position follows column + slope * row, a 2D sweep across the block
+LAYOUTS = ("lines", "columns", "flow", "diagonal")
+
+Block = Tuple[str, ...]
+
+
+def block_positions(lines: Sequence[str], layout: str = "lines", slope: int = 1) -> Tuple[List[int], int]:
+    """
+    (steps, denom) placing the characters of "".join(lines): character k sits at
+    steps[k] / denom. Integer steps keep lookup tables ('auto' resolution) exact.
+    """
+    return _unit_positions([range(len(line)) for line in lines], [len(line) for line in lines], layout, slope)
+
+
+def _unit_positions(
+    columns: Sequence[Sequence[int]], widths: Sequence[int], layout: str, slope: int
+) -> Tuple[List[int], int]:
+    """
+    block_positions for lines of units (characters or grapheme clusters): columns[row]
+    holds the column each unit of the row starts at, widths[row] the row's columns.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {', '.join(LAYOUTS)}")
+    if slope < 0:
+        raise ValueError("slope must be >= 0")
+    last = max((cols[-1] for cols in columns if cols), default=-1)  # rightmost unit's column
+    steps: List[int] = []
+    if layout == "lines":
+        # One common denominator; col * (denom // d) / denom equals col / d exactly
+        spans = [max(1, cols[-1]) if cols else 1 for cols in columns]
+        denom = 1
+        for d in spans:
+            denom = denom * d // gcd(denom, d)
+        for cols, d in zip(columns, spans):
+            scale = denom // d
+            steps.extend(col * scale for col in cols)
+    elif layout == "columns":
+        denom = max(1, last)
+        for cols in columns:
+            steps.extend(cols)
+    elif layout == "flow":
+        offset = 0
+        for cols, width in zip(columns, widths):
+            steps.extend(offset + col for col in cols)
+            offset += width
+        denom = max(1, steps[-1]) if steps else 1
+    else:
+        denom = max(1, last + slope * (len(columns) - 1))
+        for row, cols in enumerate(columns):
+            steps.extend(col + slope * row for col in cols)
+    return steps, denom
+
+
+def iter_block_frames(
+    lines: Sequence[str] | str,
+    stops_list: Sequence[GradientLike],
+    num_frames: int,
+    shift_mode: str = "wrap",
+    shift_per_frame: float | None = None,
+    engine: str = "auto",
+    compact: bool = False,
+    resolution: int | str | None = None,
+    codes: StyleLike = "ampersand",
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
+    *,
+    layout: str = "lines",
+    slope: int = 1,
+) -> Iterator[Block]:
+    """
+    Animate a multi-line block (a list of lines, or one string split at newlines)
+    as a whole: every frame is a tuple with one rendered string per line.
+
+    All lines share the compiled gradients, the phase and one table of character
+    positions (see LAYOUTS), and each frame's colors are computed for the whole
+    block in one pass before being split into lines. Lines are encoded separately,
+    so with compact=True every line starts with its own color code.
+
+    formatting and graphemes work as in iter_frames, line by line: formatting codes
+    do not carry over to the next line, and with graphemes the layouts place
+    clusters by the column they start at.
+
+    The default shift moves one character per frame: 1 / (longest line), or
+    1 / (all characters) for 'flow'. The other parameters are those of
+    per_letter_gradient_frames_multi, in the same order, and a one-line block renders
+    exactly like it; layout and slope are keyword-only. Use zip(*frames) to get
+    per-line frame lists.
+    """
+    if isinstance(lines, str):
+        lines = lines.split("\n")
+    lines = list(lines)
+    if not lines:
+        raise ValueError("lines must contain at least one line")
+    styled = None
+    if formatting or graphemes:
+        from .formatting import styled_text
+
+        style = get_style(codes)
+        styled = [styled_text(line, style, formatting, graphemes) for line in lines]
+        columns: List[Sequence[int]] = [st.steps or range(len(st.glyphs)) for st in styled]
+        widths = [st.width for st in styled]
+        text = "".join(st.glyphs for st in styled)
+    else:
+        columns = [range(len(line)) for line in lines]
+        widths = [len(line) for line in lines]
+        text = "".join(lines)
+    steps, denom = _unit_positions(columns, widths, layout, slope)
+    if shift_per_frame is None and text:
+        shift_per_frame = 1.0 / (sum(widths) if layout == "flow" else max(widths))
+    anim = _build_animation(
+        text, stops_list, num_frames, shift_mode, shift_per_frame, engine, compact, resolution, codes, space,
+        steps=steps, denom=denom,
+    )
+    if anim is None:
+        return iter([("",) * len(lines)] * max(1, num_frames))
+    return _iter_block_reusing(anim, _line_bounds(map(len, columns)), styled)
+
+
+def block_frames(
+    lines: Sequence[str] | str,
+    stops_list: Sequence[GradientLike],
+    num_frames: int,
+    shift_mode: str = "wrap",
+    shift_per_frame: float | None = None,
+    engine: str = "auto",
+    compact: bool = False,
+    resolution: int | str | None = None,
+    codes: StyleLike = "ampersand",
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
+    *,
+    layout: str = "lines",
+    slope: int = 1,
+) -> List[Block]:
+    """List form of iter_block_frames."""
+    return list(
+        iter_block_frames(
+            lines, stops_list, num_frames, shift_mode, shift_per_frame, engine, compact, resolution, codes, space,
+            formatting, graphemes, layout=layout, slope=slope,
+        )
+    )
+
+
+def _line_bounds(sizes: Iterator[int]) -> List[Tuple[int, int]]:
+    """(start, end) of each line's units in the block."""
+    bounds = []
+    start = 0
+    for size in sizes:
+        bounds.append((start, start + size))
+        start += size
+    return bounds
+
+
+def _iter_block_reusing(
+    anim: _Animation, bounds: List[Tuple[int, int]], styled: List[StyledText] | None = None
+) -> Iterator[Block]:
+    # Like gradient._iter_reusing: render the distinct frames once, then repeat them
+    if styled is not None:
+        render = partial(_iter_styled_block, anim, bounds, styled)
+    else:
+        render = partial(_iter_block, anim, bounds)
+    return _iter_periodic(anim, render, lambda block: sum(map(len, block)))
+
+
+def _iter_block(anim: _Animation, bounds: List[Tuple[int, int]], stop: int) -> Iterator[Block]:
+    """Render block frames 0..stop-1."""
+    text, style = anim.text, anim.codes
+    if anim.use_numpy:
+        from .vectorized import encode_frames
+
+        for rgb in _iter_color_chunks(anim, 0, stop):
+            per_line = [
+                encode_frames(text[s:e], rgb[:, s:e], compact=anim.compact, codes=style) if e > s else [""] * len(rgb)
+                for s, e in bounds
+            ]
+            yield from zip(*per_line)
+        return
+    # Per frame, one code per character of the block, then each line joins its slice
+    chars = style.escape(text)
+    line_chars = [(chars[s:e], range(s, e)) for s, e in bounds]
+    join = _render_frame_lut_compact if anim.compact else _render_frame_lut
+    for codes in _iter_block_codes(anim, stop):
+        yield tuple(join(cs, codes, idx, 0) for cs, idx in line_chars)
+
+
+def _iter_styled_block(
+    anim: _Animation, bounds: List[Tuple[int, int]], styled: List[StyledText], stop: int
+) -> Iterator[Block]:
+    """_iter_block for lines tokenized by formatting.styled_text (formatting codes, grapheme clusters)."""
+    from .formatting import coded_units, join_styled, join_styled_matrix
+
+    style, compact = anim.codes, anim.compact
+    if anim.use_numpy:
+        for rgb in _iter_color_chunks(anim, 0, stop):
+            per_line = [
+                list(join_styled_matrix(st, style, rgb[:, s:e], compact)) for st, (s, e) in zip(styled, bounds)
+            ]
+            yield from zip(*per_line)
+        return
+    line_units = [(st, [s + i for i in coded_units(st, compact)]) for st, (s, _e) in zip(styled, bounds)]
+    for codes in _iter_block_codes(anim, stop):
+        yield tuple(join_styled(st, [codes[i] for i in units], compact) for st, units in line_units)
+
+
+def _iter_block_codes(anim: _Animation, stop: int) -> Iterator[List[str]]:
+    """For frames 0..stop-1, the color code of every unit of the block."""
+    grads, style = anim.grads, anim.codes
+    m = len(grads)
+    if anim.resolution:
+        pos_idx = anim.position_indices()
+        tables = [prefix_table(g, anim.resolution, style) * 2 for g in grads]
+        for f in range(stop):
+            table, offset = tables[f % m], anim.phase_index(f)
+            yield [table[p + offset] for p in pos_idx]
+        return
+    encode = _encoder(style)
+    positions = anim.positions()
+    for f in range(stop):
+        sample, phase = grads[f % m].sample, anim.phase(f)
+        yield [encode(sample(t + phase)) for t in positions]
+
+
+__all__ = [
+    "LAYOUTS",
+    "block_positions",
+    "iter_block_frames",
+    "block_frames",
+]
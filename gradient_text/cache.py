@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, TextIO
+
+from .emitters import StyleLike, get_style
+from .gradient import GradientLike, compile_gradient, iter_frames, write_yaml
+from .presets import _presets_dir
+
+
+CACHE_DIR_NAME = "render_cache"
+CACHE_SUFFIX = ".yml"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bump when the rendered output for an unchanged spec changes, so stale entries are never served.
+CACHE_FORMAT = 1
+
+
+def cache_dir() -> Path:
+    p = _presets_dir() / CACHE_DIR_NAME
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+
+def spec_key(
+    text: str,
+    stops_list: Sequence[GradientLike],
+    num_frames: int,
+    shift_mode: str = "wrap",
+    shift_per_frame: float | None = None,
+    **output_options: Any,
+) -> str:
+    """
+    Content hash of everything that determines the rendered output. Gradients are
+    hashed in compiled (normalized) form, so equivalent stop lists share entries.
+    """
+    grads = [compile_gradient(stops) for stops in stops_list]
+    spec: Dict[str, Any] = {
+        "format": CACHE_FORMAT,
+        "text": text,
+        # The blend space is only recorded when it isn't plain rgb, so older keys stay valid
+        "gradients": [
+            [[float(p) for p in g.positions], [list(c) for c in g.colors]] + ([g.space] if g.space != "rgb" else [])
+            for g in grads
+        ],
+        "frames": num_frames,
+        "shift_mode": shift_mode,
+        "shift_per_frame": shift_per_frame,
+        "output": output_options,
+    }
+    payload = json.dumps(spec, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return cache_dir() / f"{key}{CACHE_SUFFIX}"
+
+
+def lookup(key: str) -> Optional[Path]:
+    """Path of the cached output for key, or None. A hit marks the entry as recently used."""
+    path = _entry_path(key)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def get(key: str) -> Optional[str]:
+    path = lookup(key)
+    if path is None:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return f.read()
+    except FileNotFoundError:
+        # Evicted by another process between lookup and read
+        return None
+
+
+def store(key: str, write: Callable[[TextIO], Any], max_bytes: int = DEFAULT_MAX_BYTES) -> Path:
+    """
+    Create the entry for key by calling write(fileobj), then evict least recently
+    used entries until the cache fits in max_bytes. The entry appears atomically.
+    """
+    import tempfile  # only needed on a miss; keeps cache hits off its import cost
+
+    d = cache_dir()
+    fd, tmp = tempfile.mkstemp(dir=d, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            write(f)
+        path = _entry_path(key)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    evict(max_bytes, keep=path)
+    return path
+
+
+def put(key: str, data: str, max_bytes: int = DEFAULT_MAX_BYTES) -> Path:
+    return store(key, lambda f: f.write(data), max_bytes=max_bytes)
+
+
+def evict(max_bytes: int = DEFAULT_MAX_BYTES, keep: Optional[Path] = None) -> int:
+    """Delete least recently used entries until the total size is <= max_bytes. Returns entries removed."""
+    entries = []
+    total = 0
+    for p in cache_dir().glob(f"*{CACHE_SUFFIX}"):
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+        total += st.st_size
+    entries.sort(key=lambda e: e[0])
+    removed = 0
+    for _mtime, size, p in entries:
+        if total <= max_bytes:
+            break
+        if keep is not None and p == keep:
+            continue
+        try:
+            p.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+    return removed
+
+
+def clear() -> int:
+    """Remove every cache entry. Returns the number of entries removed."""
+    removed = 0
+    for p in cache_dir().iterdir():
+        if p.suffix in (CACHE_SUFFIX, ".tmp"):
+            try:
+                p.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def render_yaml(
+    text: str,
+    stops_list: Sequence[GradientLike],
+    num_frames: int,
+    shift_mode: str = "wrap",
+    shift_per_frame: float | None = None,
+    change_interval_ms: int = 200,
+    root_key: str = "web",
+    list_key: str = "texts",
+    compact: bool = False,
+    resolution: int | str | None = None,
+    codes: StyleLike = "ampersand",
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
+    engine: str = "auto",
+    use_cache: bool = True,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> str:
+    """
+    Same result as frames_to_yaml(per_letter_gradient_frames_multi(...)), served
+    from the on-disk cache when this exact spec was rendered before.
+    """
+    stops_list = [compile_gradient(stops, space) for stops in stops_list]
+    key = None
+    if use_cache:
+        key = spec_key(
+            text, stops_list, num_frames, shift_mode, shift_per_frame,
+            change_interval_ms=int(change_interval_ms), root_key=root_key, list_key=list_key, compact=compact,
+            resolution=resolution, format="yaml", codes=get_style(codes).name,
+            **{k: True for k, on in (("formatting", formatting), ("graphemes", graphemes)) if on},
+        )
+        hit = get(key)
+        if hit is not None:
+            return hit
+    buf = io.StringIO()
+    frames = iter_frames(
+        text, stops_list, num_frames, shift_mode, shift_per_frame, engine, compact, resolution, codes,
+        formatting=formatting, graphemes=graphemes,
+    )
+    write_yaml(frames, buf, change_interval_ms=change_interval_ms, root_key=root_key, list_key=list_key)
+    y = buf.getvalue()
+    if key is not None:
+        put(key, y, max_bytes=max_bytes)
+    return y
+
+
+__all__ = [
+    "cache_dir",
+    "spec_key",
+    "lookup",
+    "get",
+    "store",
+    "put",
+    "evict",
+    "clear",
+    "render_yaml",
+]
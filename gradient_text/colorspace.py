@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import colorsys
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+
+RGB = Tuple[int, int, int]
+Coords = Tuple[float, float, float]
+
+# Spaces a gradient can blend its stops in. 'rgb' is the plain per-channel sRGB blend;
+# the others are sampled once per gradient into a dense table (see dense_table).
+SPACES = ("rgb", "linear", "oklab", "hsv")
+
+# Intervals in a dense table. Rounding t to this grid moves a color by at most a unit
+# or two for gradients of up to ten evenly spaced stops (more for stops packed closer).
+DENSE_STEPS = 4096
+
+
+def check_space(space: str) -> str:
+    if space not in SPACES:
+        raise ValueError(f"space must be one of {', '.join(SPACES)}")
+    return space
+
+
+def _srgb_to_linear(c: float) -> float:
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+# Shared sRGB <-> linear tables. Decoding is a lookup per byte; encoding finds the byte
+# whose rounding interval holds the value: _LINEAR_THRESHOLDS[k] is the linear value
+# halfway between bytes k and k + 1, so bisection gives round(encode(c) * 255) exactly.
+SRGB_TO_LINEAR: Tuple[float, ...] = tuple(_srgb_to_linear(v / 255) for v in range(256))
+_LINEAR_THRESHOLDS: Tuple[float, ...] = tuple(_srgb_to_linear((k + 0.5) / 255) for k in range(255))
+
+
+def linear_to_byte(c: float) -> int:
+    return bisect_right(_LINEAR_THRESHOLDS, c)
+
+
+def _to_linear(rgb: RGB) -> Coords:
+    lut = SRGB_TO_LINEAR
+    return lut[rgb[0]], lut[rgb[1]], lut[rgb[2]]
+
+
+def _from_linear(c: Coords) -> RGB:
+    return linear_to_byte(c[0]), linear_to_byte(c[1]), linear_to_byte(c[2])
+
+
+# OKLab (Björn Ottosson, 2020), from and to linear sRGB
+def _to_oklab(rgb: RGB) -> Coords:
+    r, g, b = _to_linear(rgb)
+    l_ = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m_ = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s_ = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (
+        0.2104542553 * l_ + 0.7936177850 * m_ - 0.0040720468 * s_,
+        1.9779984951 * l_ - 2.4285922050 * m_ + 0.4505937099 * s_,
+        0.0259040371 * l_ + 0.7827717662 * m_ - 0.8086757660 * s_,
+    )
+
+
+def _from_oklab(lab: Coords) -> RGB:
+    L, a, b = lab
+    l = (L + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (L - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (L - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    return _from_linear((
+        4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s,
+        -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s,
+        -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s,
+    ))
+
+
+def _to_hsv(rgb: RGB) -> Coords:
+    return colorsys.rgb_to_hsv(rgb[0] / 255, rgb[1] / 255, rgb[2] / 255)
+
+
+def _from_hsv(hsv: Coords) -> RGB:
+    r, g, b = colorsys.hsv_to_rgb(hsv[0] % 1.0, hsv[1], hsv[2])
+    return int(round(r * 255)), int(round(g * 255)), int(round(b * 255))
+
+
+def _lerp3(a: Coords, b: Coords, t: float) -> Coords:
+    return a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t, a[2] + (b[2] - a[2]) * t
+
+
+def _lerp_hsv(a: Coords, b: Coords, t: float) -> Coords:
+    ha, hb = a[0], b[0]
+    # A gray has no hue of its own; take the other end's so the blend doesn't sweep the wheel
+    if a[1] == 0:
+        ha = hb
+    elif b[1] == 0:
+        hb = ha
+    # Shortest way around the hue circle
+    if hb - ha > 0.5:
+        ha += 1.0
+    elif ha - hb > 0.5:
+        hb += 1.0
+    return ha + (hb - ha) * t, a[1] + (b[1] - a[1]) * t, a[2] + (b[2] - a[2]) * t
+
+
+_CONVERTERS: Dict[str, Tuple[Callable[[RGB], Coords], Callable[[Coords], RGB], Callable[[Coords, Coords, float], Coords]]] = {
+    "linear": (_to_linear, _from_linear, _lerp3),
+    "oklab": (_to_oklab, _from_oklab, _lerp3),
+    "hsv": (_to_hsv, _from_hsv, _lerp_hsv),
+}
+
+
+def mix(a: RGB, b: RGB, t: float, space: str) -> RGB:
+    """Blend two sRGB colors in the given space (exact; used to build the dense tables)."""
+    if check_space(space) == "rgb":
+        return (
+            int(round(a[0] + (b[0] - a[0]) * t)),
+            int(round(a[1] + (b[1] - a[1]) * t)),
+            int(round(a[2] + (b[2] - a[2]) * t)),
+        )
+    to_space, from_space, lerp = _CONVERTERS[space]
+    return from_space(lerp(to_space(a), to_space(b), t))
+
+
+@lru_cache(maxsize=64)
+def dense_table(
+    positions: Tuple[float, ...],
+    colors: Tuple[RGB, ...],
+    space: str,
+    steps: int = DENSE_STEPS,
+) -> Tuple[RGB, ...]:
+    """
+    The gradient with normalized stops (positions, colors) blended in `space`, sampled
+    at k / steps for k in 0..steps. Stop colors are converted once, and each sample is
+    one blend plus one conversion back; frames then only index into the table.
+    """
+    to_space, from_space, lerp = _CONVERTERS[check_space(space)]
+    coords: List[Coords] = [to_space(c) for c in colors]
+    last = len(positions) - 1
+    table: List[RGB] = []
+    for k in range(steps + 1):
+        t = k / steps
+        # Same segment choice as CompiledGradient.sample
+        i = bisect_left(positions, t, 1)
+        if i > last:
+            table.append(colors[-1])
+            continue
+        left = positions[i - 1]
+        span = max(1e-8, positions[i] - left)
+        table.append(from_space(lerp(coords[i - 1], coords[i], (t - left) / span)))
+    return tuple(table)
+
+
+__all__ = [
+    "SPACES",
+    "DENSE_STEPS",
+    "SRGB_TO_LINEAR",
+    "check_space",
+    "linear_to_byte",
+    "mix",
+    "dense_table",
+]
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, TextIO, Tuple, Union
+
+
+@dataclass(frozen=True)
+class CodeStyle:
+    """How one color is written: head, the six hex digits (each after digit_prefix), tail."""
+    name: str
+    head: str
+    tail: str = ""
+    digit_prefix: str = ""
+    # (char, replacement) pairs for text characters the target would read as markup
+    escapes: Tuple[Tuple[str, str], ...] = ()
+    # (letter, code) for the formatting codes k l m n o r, see formatting.py
+    formats: Tuple[Tuple[str, str], ...] = ()
+    # Whether a color code turns formatting off (Minecraft's legacy codes do)
+    color_resets_formats: bool = True
+
+    def code(self, rgb: Tuple[int, int, int]) -> str:
+        return _encoder(self)(rgb)
+
+    def escape(self, text: str) -> List[str]:
+        """Each character of text as it must appear in the output."""
+        if not self.escapes:
+            return list(text)
+        table = dict(self.escapes)
+        return [table.get(ch, ch) for ch in text]
+
+    @property
+    def width(self) -> int:
+        """Characters in one code."""
+        return len(self.code((0, 0, 0)))
+
+    def template(self) -> Tuple[bytes, Tuple[int, ...]]:
+        """UTF-8 bytes of a code with '0' digits, and the byte offsets of the six digits."""
+        head = self.head.encode("utf-8")
+        prefix = self.digit_prefix.encode("utf-8")
+        step = len(prefix) + 1
+        offsets = tuple(len(head) + k * step + len(prefix) for k in range(6))
+        return self.code((0, 0, 0)).encode("utf-8"), offsets
+
+
+@lru_cache(maxsize=None)
+def _encoder(style: CodeStyle) -> Callable[[Tuple[int, int, int]], str]:
+    """Fastest rgb -> code function for style (used once per character by the renderers)."""
+    if not style.digit_prefix:
+        # One C-level format call per color
+        fmt = style.head.replace("%", "%%") + "%02X%02X%02X" + style.tail.replace("%", "%%")
+        return fmt.__mod__
+    byte = [f"{style.digit_prefix}{v >> 4:X}{style.digit_prefix}{v & 15:X}" for v in range(256)]
+    head, tail = style.head, style.tail
+
+    def encode(rgb: Tuple[int, int, int]) -> str:
+        r, g, b = rgb
+        return head + byte[r] + byte[g] + byte[b] + tail
+
+    return encode
+
+
+AMPERSAND = CodeStyle("ampersand", "&#", formats=tuple((c, "&" + c) for c in "klmnor"))
+# MiniMessage reads '<' as the start of a tag and '\' as an escape
+MINIMESSAGE = CodeStyle(
+    "minimessage", "<#", ">", escapes=(("\\", "\\\\"), ("<", "\\<")),
+    formats=(
+        ("k", "<obfuscated>"), ("l", "<bold>"), ("m", "<strikethrough>"),
+        ("n", "<underlined>"), ("o", "<italic>"), ("r", "<reset>"),
+    ),
+    color_resets_formats=False,
+)
+LEGACY = CodeStyle("legacy", "§x", digit_prefix="§", formats=tuple((c, "§" + c) for c in "klmnor"))
+
+STYLES: Dict[str, CodeStyle] = {s.name: s for s in (AMPERSAND, MINIMESSAGE, LEGACY)}
+
+StyleLike = Union[str, CodeStyle]
+
+
+def register_style(style: CodeStyle) -> None:
+    STYLES[style.name] = style
+
+
+def get_style(style: StyleLike) -> CodeStyle:
+    if isinstance(style, CodeStyle):
+        return style
+    try:
+        return STYLES[style]
+    except KeyError:
+        raise ValueError(f"codes must be one of {', '.join(STYLES)}") from None
+
+
+# Containers
+# A writer takes (frames, fileobj, change_interval_ms, root_key, list_key), streams
+# the frames one at a time and returns how many it wrote.
+FrameWriter = Callable[..., int]
+
+
+def _yaml_header(change_interval_ms: int, root_key: str, list_key: str) -> str:
+    return f"{root_key}:\n  change-interval: {int(change_interval_ms)}\n  {list_key}:\n"
+
+
+def _yaml_item(frame: str) -> str:
+    # Single-quoted scalar; single quotes are escaped by doubling, '&' and '#' are kept as-is.
+    y = frame.replace("'", "''")
+    return f"  - '{y}'\n"
+
+
+def frames_to_yaml(
+    frames: List[str],
+    change_interval_ms: int = 200,
+    root_key: str = "web",
+    list_key: str = "texts",
+) -> str:
+    """Format frames as a YAML snippet matching the user's example."""
+    # Simple YAML emitter to avoid external deps.
+    parts = [_yaml_header(change_interval_ms, root_key, list_key)]
+    parts.extend(_yaml_item(s) for s in frames)
+    return "".join(parts)
+
+
+def write_yaml(
+    frames: Iterable[str],
+    fileobj: TextIO,
+    change_interval_ms: int = 200,
+    root_key: str = "web",
+    list_key: str = "texts",
+) -> int:
+    """
+    Write frames to fileobj in the same format as frames_to_yaml, one frame at a time.
+    Pair with iter_frames to emit huge animations with constant memory.
+    Returns the number of frames written.
+    """
+    fileobj.write(_yaml_header(change_interval_ms, root_key, list_key))
+    count = 0
+    for s in frames:
+        fileobj.write(_yaml_item(s))
+        count += 1
+    return count
+
+
+def write_json(
+    frames: Iterable[str],
+    fileobj: TextIO,
+    change_interval_ms: int = 200,
+    root_key: str = "web",
+    list_key: str = "texts",
+) -> int:
+    """The YAML structure as JSON: {root_key: {"change-interval": ms, list_key: [frames]}}."""
+    fileobj.write(
+        f"{{\n  {json.dumps(root_key)}: {{\n    \"change-interval\": {int(change_interval_ms)},\n"
+        f"    {json.dumps(list_key)}: ["
+    )
+    count = 0
+    for s in frames:
+        fileobj.write(("\n      " if count == 0 else ",\n      ") + json.dumps(s, ensure_ascii=False))
+        count += 1
+    fileobj.write("\n    ]\n  }\n}\n" if count else "]\n  }\n}\n")
+    return count
+
+
+def write_lines(frames: Iterable[str], fileobj: TextIO, **_options) -> int:
+    """One frame per line, nothing else."""
+    count = 0
+    for s in frames:
+        fileobj.write(s + "\n")
+        count += 1
+    return count
+
+
+CONTAINERS: Dict[str, FrameWriter] = {"yaml": write_yaml, "json": write_json, "lines": write_lines}
+EXTENSIONS: Dict[str, str] = {"yaml": ".yml", "json": ".json", "lines": ".txt"}
+
+
+def register_container(name: str, writer: FrameWriter, extension: str = ".txt") -> None:
+    CONTAINERS[name] = writer
+    EXTENSIONS[name] = extension
+
+
+def write_frames(frames: Iterable[str], fileobj: TextIO, container: str = "yaml", **options) -> int:
+    """Stream frames to fileobj with the named container writer; returns the frame count."""
+    try:
+        writer = CONTAINERS[container]
+    except KeyError:
+        raise ValueError(f"format must be one of {', '.join(CONTAINERS)}") from None
+    return writer(frames, fileobj, **options)
+
+
+__all__ = [
+    "CodeStyle",
+    "AMPERSAND",
+    "MINIMESSAGE",
+    "LEGACY",
+    "STYLES",
+    "register_style",
+    "get_style",
+    "frames_to_yaml",
+    "write_yaml",
+    "write_json",
+    "write_lines",
+    "CONTAINERS",
+    "EXTENSIONS",
+    "register_container",
+    "write_frames",
+]
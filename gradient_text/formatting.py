@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator, List, Sequence, Tuple
+
+from .emitters import CodeStyle, _encoder
+
+if TYPE_CHECKING:
+    from .gradient import _Animation
+
+
+# Minecraft formatting codes: obfuscated, bold, strikethrough, underline, italic, reset
+FORMAT_LETTERS = "klmnor"
+# Input text may write them either way: '&l' or '§l'
+FORMAT_PREFIXES = "&§"
+
+
+def split_formatting(text: str) -> Tuple[str, List[Tuple[str, ...]]]:
+    """
+    The text with its formatting codes removed, and for each remaining character
+    the format letters in effect there, in the order they were turned on.
+    """
+    glyphs: List[str] = []
+    active: List[Tuple[str, ...]] = []
+    cur: Tuple[str, ...] = ()
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch in FORMAT_PREFIXES and i + 1 < n and text[i + 1].lower() in FORMAT_LETTERS:
+            letter = text[i + 1].lower()
+            if letter == "r":
+                cur = ()
+            elif letter not in cur:
+                cur += (letter,)
+            i += 2
+            continue
+        glyphs.append(ch)
+        active.append(cur)
+        i += 1
+    return "".join(glyphs), active
+
+
+@dataclass(frozen=True)
+class StyledText:
+    """
+    A text tokenized once per code style into units: characters, or grapheme
+    clusters with graphemes=True. Unit i renders as leads[i], then either its
+    color code and tails[i] or, without a code, plain_tails[i]. `colored` units get
+    a code in full output, `visible` ones (not whitespace) in compact output, and a
+    `forced` one needs it even when the color did not change, because formatting
+    was reset just before it.
+    """
+    glyphs: str  # the text without formatting codes
+    leads: Tuple[str, ...]
+    tails: Tuple[str, ...]
+    plain_tails: Tuple[str, ...]
+    colored: Tuple[bool, ...]
+    visible: Tuple[bool, ...]
+    forced: Tuple[bool, ...]
+    # The non-compact frame as a %-format taking the colored units' codes
+    template: str
+    # Unit i sits at steps[i] / denom on the gradient; () means i / (units - 1)
+    steps: Tuple[int, ...] = ()
+    denom: int = 0
+    width: int = 0  # columns the glyphs take (the unit count without graphemes)
+
+
+@lru_cache(maxsize=256)
+def styled_text(text: str, style: CodeStyle, formatting: bool = True, graphemes: bool = False) -> StyledText:
+    """
+    Tokenize text for rendering in `style`: read its '&l'-style formatting codes
+    (formatting=True) and/or group it into grapheme clusters positioned by visible
+    width (graphemes=True, see segment.py).
+    """
+    formats = dict(style.formats)
+    if formatting:
+        if not formats:
+            raise ValueError(f"code style '{style.name}' has no formatting codes")
+        glyphs, active = split_formatting(text)
+    else:
+        glyphs, active = text, [()] * len(text)
+    steps: Tuple[int, ...] = ()
+    denom = 0
+    width = len(glyphs)
+    if graphemes:
+        from .segment import cluster_columns, grapheme_clusters
+
+        units = grapheme_clusters(glyphs)
+        starts = []
+        k = 0
+        for unit in units:
+            starts.append(active[k])  # a cluster takes the formats of its first character
+            k += len(unit)
+        active = starts
+        steps, width = cluster_columns(glyphs)
+        denom = max(1, steps[-1]) if steps else 1
+    else:
+        units = tuple(glyphs)
+    resets = style.color_resets_formats
+    leads: List[str] = []
+    tails: List[str] = []
+    plain_tails: List[str] = []
+    visible: List[bool] = []
+    forced: List[bool] = []
+    prev: Tuple[str, ...] = ()
+    pending = False  # formatting (and so the color) was reset since the last color code
+    for unit, cur in zip(units, active):
+        ch = "".join(style.escape(unit))
+        shown = not unit.isspace()
+        removed = any(f not in cur for f in prev)
+        full = "".join(formats[f] for f in cur)
+        added = "".join(formats[f] for f in cur if f not in prev)
+        lead = ""
+        if removed and (shown and resets):
+            # This unit's color code turns the old formats off by itself
+            tail = plain = full + ch
+        elif removed:
+            lead = formats["r"]
+            tail = plain = full + ch
+            pending = True
+        else:
+            tail = (full if resets else added) + ch
+            plain = added + ch
+        leads.append(lead)
+        tails.append(tail)
+        plain_tails.append(plain)
+        visible.append(shown)
+        forced.append(shown and (removed or pending))
+        if shown:
+            pending = False
+        prev = cur
+    # Formatted output leaves whitespace uncolored; otherwise, as in plain output,
+    # only compact mode does
+    colored = visible if formatting else [True] * len(units)
+    template = "".join(
+        _literal(lead) + ("%s" + _literal(tail) if c else _literal(plain))
+        for lead, tail, plain, c in zip(leads, tails, plain_tails, colored)
+    )
+    return StyledText(
+        glyphs=glyphs,
+        leads=tuple(leads),
+        tails=tuple(tails),
+        plain_tails=tuple(plain_tails),
+        colored=tuple(colored),
+        visible=tuple(visible),
+        forced=tuple(forced),
+        template=template,
+        steps=steps,
+        denom=denom,
+        width=width,
+    )
+
+
+def _literal(s: str) -> str:
+    return s.replace("%", "%%")
+
+
+def join_styled(st: StyledText, codes: Sequence[str], compact: bool) -> str:
+    """
+    One frame from the color codes of st's colored units (visible units when
+    compact), in order.
+    """
+    if not compact:
+        return st.template % tuple(codes)
+    parts: List[str] = []
+    last = None
+    it = iter(codes)
+    for lead, tail, plain, visible, forced in zip(st.leads, st.tails, st.plain_tails, st.visible, st.forced):
+        if lead:
+            parts.append(lead)
+        if visible:
+            code = next(it)
+            if forced or code != last:
+                last = code
+                parts.append(code)
+                parts.append(tail)
+                continue
+        parts.append(plain)
+    return "".join(parts)
+
+
+def coded_units(st: StyledText, compact: bool) -> List[int]:
+    """Indices of the units join_styled takes a color code for."""
+    return [i for i, c in enumerate(st.visible if compact else st.colored) if c]
+
+
+def join_styled_matrix(st: StyledText, style: CodeStyle, rgb, compact: bool) -> Iterator[str]:
+    """Frames from a NumPy frames x units x 3 color matrix."""
+    import numpy as np
+
+    encode = _encoder(style)
+    # Encode each distinct color of the matrix once, then index
+    sub = rgb[:, coded_units(st, compact)].astype(np.uint32)
+    packed = (sub[:, :, 0] << 16) | (sub[:, :, 1] << 8) | sub[:, :, 2]
+    uniq, inverse = np.unique(packed, return_inverse=True)
+    table = [encode((v >> 16, (v >> 8) & 255, v & 255)) for v in uniq.tolist()]
+    for row in inverse.reshape(packed.shape).tolist():
+        yield join_styled(st, [table[k] for k in row], compact)
+
+
+def iter_styled(anim: _Animation, first: int, end: int) -> Iterator[str]:
+    """Render frames first..end-1 of an animation over a StyledText's units."""
+    from .gradient import _iter_color_chunks, prefix_table
+
+    st, style, grads = anim.styled, anim.codes, anim.grads
+    cols = coded_units(st, anim.compact)
+    m = len(grads)
+    if anim.use_numpy:
+        for rgb in _iter_color_chunks(anim, first, end):
+            yield from join_styled_matrix(st, style, rgb, anim.compact)
+        return
+    if anim.resolution:
+        pos_idx = anim.position_indices()
+        pos_idx = [pos_idx[i] for i in cols]
+        tables = [prefix_table(g, anim.resolution, style) * 2 for g in grads]
+        for f in range(first, end):
+            table, offset = tables[f % m], anim.phase_index(f)
+            yield join_styled(st, [table[p + offset] for p in pos_idx], anim.compact)
+        return
+    encode = _encoder(style)
+    positions = anim.positions()
+    positions = [positions[i] for i in cols]
+    for f in range(first, end):
+        sample, phase = grads[f % m].sample, anim.phase(f)
+        yield join_styled(st, [encode(sample(t + phase)) for t in positions], anim.compact)
+
+
+__all__ = [
+    "FORMAT_LETTERS",
+    "split_formatting",
+    "StyledText",
+    "styled_text",
+]
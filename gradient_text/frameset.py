@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import copy
+from array import array
+from functools import lru_cache
+from itertools import chain
+from typing import Iterator, List, Sequence, TextIO, Tuple, overload
+
+from .emitters import CodeStyle, StyleLike, _encoder, get_style, write_frames
+from .gradient import (
+    GradientLike,
+    _STREAM_CHUNK,
+    _build_animation,
+    _distinct_frames,
+    _frame_colors,
+    _iter_color_chunks,
+    _use_numpy,
+)
+
+
+class FrameSet(Sequence[str]):
+    """
+    The frames of an animation, stored as colors instead of strings.
+
+    The text is kept once and each distinct frame as one RGB byte triple per
+    character (frame f shows row f % rows, so periodic animations store one
+    period). That is 3 bytes per character against 9 or more for the encoded
+    string; frames are encoded when indexed or iterated.
+
+    With formatting=True and/or graphemes=True the text is read as by iter_frames()
+    and there is one triple per unit of formatting.styled_text(): per character of
+    the text without its formatting codes, or per grapheme cluster.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        colors: bytes | bytearray | array,
+        num_frames: int | None = None,
+        compact: bool = False,
+        codes: StyleLike = "ampersand",
+        engine: str = "auto",
+        formatting: bool = False,
+        graphemes: bool = False,
+    ):
+        style = get_style(codes)
+        self._styled = None
+        units = len(text)
+        if formatting or graphemes:
+            from .formatting import styled_text
+
+            self._styled = styled_text(text, style, formatting, graphemes)
+            units = len(self._styled.leads)
+        row_len = 3 * units
+        if row_len and len(colors) % row_len:
+            raise ValueError("colors must hold 3 bytes per character of each frame")
+        rows = len(colors) // row_len if row_len else 1
+        if num_frames is None:
+            num_frames = rows
+        if num_frames <= 0 or not rows:
+            raise ValueError("num_frames must be > 0")
+        self.text = text
+        self.compact = compact
+        self.codes = style
+        self.engine = engine
+        self._units = units
+        self._colors = colors
+        self._rows = rows
+        self._frames = range(num_frames)  # slices narrow this; rows are shared
+        self._chars = self.codes.escape(text)
+        self._format: str | None = None
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "FrameSet": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            view = copy.copy(self)
+            view._frames = self._frames[index]
+            return view
+        return self._encode(self._frames[index] % self._rows)
+
+    def __iter__(self) -> Iterator[str]:
+        n = self._units
+        if not n or not _use_numpy(self.engine, len(self) * n):
+            return map(self._encode, (f % self._rows for f in self._frames))
+        return self._iter_vectorized()
+
+    def __repr__(self) -> str:
+        return f"FrameSet({self.text!r}, {len(self)} frames, {self._rows} stored)"
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of color data held (shared with slices of this set)."""
+        return len(self._colors)
+
+    def colors(self, index: int) -> List[Tuple[int, int, int]]:
+        """RGB of each character (unit with formatting or graphemes) in frame `index`."""
+        row = self._row(self._frames[index] % self._rows)
+        it = iter(row)
+        return list(zip(it, it, it))
+
+    def write(self, fileobj: TextIO, container: str = "yaml", **options) -> int:
+        """Stream the frames to fileobj with write_frames(); returns the frame count."""
+        return write_frames(iter(self), fileobj, container, **options)
+
+    def _row(self, row: int) -> Sequence[int]:
+        row_len = 3 * self._units
+        return self._colors[row * row_len:(row + 1) * row_len]
+
+    def _encode(self, row: int) -> str:
+        rgb = self._row(row)
+        style = self.codes
+        if self._styled is not None:
+            from .formatting import coded_units, join_styled
+
+            encode = _encoder(style)
+            return join_styled(
+                self._styled, [encode(tuple(rgb[3 * i:3 * i + 3])) for i in coded_units(self._styled, self.compact)],
+                self.compact,
+            )
+        if self.compact:
+            return _encode_compact(self._chars, rgb, _encoder(style))
+        if self._format is None:
+            self._format = _row_format(self._chars, style)
+        if style.digit_prefix:
+            digits = _prefixed_digits(style.digit_prefix)
+            return self._format % tuple(map(digits.__getitem__, rgb))
+        return self._format % tuple(rgb)
+
+    def _iter_vectorized(self) -> Iterator[str]:
+        import numpy as np
+
+        from .vectorized import encode_frames
+
+        from .formatting import join_styled_matrix
+
+        matrix = np.frombuffer(self._colors, dtype=np.uint8).reshape(self._rows, self._units, 3)
+        frames = self._frames
+        for start in range(0, len(frames), _STREAM_CHUNK):
+            chunk = frames[start:start + _STREAM_CHUNK]
+            rows = np.arange(chunk.start, chunk.stop, chunk.step) % self._rows
+            if self._styled is not None:
+                yield from join_styled_matrix(self._styled, self.codes, matrix[rows], self.compact)
+            else:
+                yield from encode_frames(self.text, matrix[rows], compact=self.compact, codes=self.codes)
+
+
+def _row_format(chars: List[str], style: CodeStyle) -> str:
+    """A %-format that encodes a whole frame from its flat color values."""
+    digit = "%s" if style.digit_prefix else "%02X"
+    code = style.head.replace("%", "%%") + digit * 3 + style.tail.replace("%", "%%")
+    return "".join(code + ch.replace("%", "%%") for ch in chars)
+
+
+@lru_cache(maxsize=None)
+def _prefixed_digits(prefix: str) -> List[str]:
+    """Byte value -> its two hex digits, each after prefix (legacy '§')."""
+    return [f"{prefix}{v >> 4:X}{prefix}{v & 15:X}" for v in range(256)]
+
+
+def _encode_compact(chars: List[str], rgb: Sequence[int], encode) -> str:
+    # Same rules as gradient._render_frame_compact
+    parts: List[str] = []
+    last = None
+    it = iter(rgb)
+    for ch, color in zip(chars, zip(it, it, it)):
+        if ch.isspace():
+            parts.append(ch)
+            continue
+        if color != last:
+            last = color
+            parts.append(encode(color))
+        parts.append(ch)
+    return "".join(parts)
+
+
+def frame_set(
+    text: str,
+    stops_list: Sequence[GradientLike],
+    num_frames: int,
+    shift_mode: str = "wrap",
+    shift_per_frame: float | None = None,
+    engine: str = "auto",
+    compact: bool = False,
+    resolution: int | str | None = None,
+    codes: StyleLike = "ampersand",
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
+) -> FrameSet:
+    """
+    per_letter_gradient_frames_multi() as a FrameSet: the same frames, with only the
+    colors of the distinct ones kept in memory.
+    """
+    anim = _build_animation(
+        text, stops_list, num_frames, shift_mode, shift_per_frame, engine, compact, resolution, codes, space,
+        formatting, graphemes,
+    )
+    if anim is None:
+        return FrameSet("", b"", max(1, num_frames), compact, codes, engine)
+    rows = _distinct_frames(anim)
+    colors = array("B")
+    if anim.use_numpy:
+        for rgb in _iter_color_chunks(anim, 0, rows):
+            colors.frombytes(rgb.tobytes())
+    else:
+        for f in range(rows):
+            colors.extend(chain.from_iterable(_frame_colors(anim, f)))
+    return FrameSet(text, colors, num_frames, compact, anim.codes, engine, formatting, graphemes)
+
+
+__all__ = [
+    "FrameSet",
+    "frame_set",
+]
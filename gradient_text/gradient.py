@@ -1,7 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Tuple
+from bisect import bisect_left
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from math import gcd
+from typing import TYPE_CHECKING, Callable, Iterator, List, Sequence, Tuple, TypeVar, Union
+
+from .colorspace import DENSE_STEPS, check_space, dense_table
+from .emitters import AMPERSAND, CodeStyle, StyleLike, _encoder, frames_to_yaml, get_style, write_yaml
+
+if TYPE_CHECKING:
+    from .formatting import StyledText
+
+_T = TypeVar("_T")
 
 
 @dataclass(frozen=True)
@@ -62,152 +73,711 @@ def normalize_stops(stops: List[ColorStop]) -> List[ColorStop]:
     return clamped
 
 
-def sample_gradient(stops: List[ColorStop], t: float, wrap: bool = True) -> Tuple[int, int, int]:
+@dataclass(frozen=True)
+class CompiledGradient:
+    """
+    Gradient prepared once for repeated sampling: stops are normalized a single time
+    and kept as parallel, position-sorted tuples so segments are found by bisection.
+
+    space picks where stops are blended (see colorspace.SPACES). Anything but 'rgb' is
+    sampled once into a dense table, so sample() is a single lookup whatever the space.
+    """
+    positions: Tuple[float, ...]
+    colors: Tuple[Tuple[int, int, int], ...]
+    space: str = "rgb"
+    table: Tuple[Tuple[int, int, int], ...] = field(default=(), compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if check_space(self.space) != "rgb" and not self.table:
+            object.__setattr__(self, "table", dense_table(self.positions, self.colors, self.space))
+
+    @staticmethod
+    def from_stops(stops: List[ColorStop], space: str = "rgb") -> "CompiledGradient":
+        s = normalize_stops(stops)
+        return CompiledGradient(
+            positions=tuple(st.position for st in s),
+            colors=tuple(st.color for st in s),
+            space=space,
+        )
+
+    def sample(self, t: float, wrap: bool = True) -> Tuple[int, int, int]:
+        if wrap:
+            t = t % 1.0
+        else:
+            t = clamp01(t)
+        if self.table:
+            return self.table[int(t * DENSE_STEPS + 0.5)]
+        pos = self.positions
+        # First stop at or after t (index 0 is always 0.0, so start at 1)
+        i = bisect_left(pos, t, 1)
+        if i >= len(pos):
+            return self.colors[-1]
+        left = pos[i - 1]
+        span = max(1e-8, pos[i] - left)
+        return _lerp_rgb(self.colors[i - 1], self.colors[i], (t - left) / span)
+
+
+GradientLike = Union[Sequence[ColorStop], CompiledGradient]
+
+
+def compile_gradient(stops: GradientLike, space: str | None = None) -> CompiledGradient:
+    """
+    Compile a list of stops, blended in `space` ('rgb' if None). Already compiled
+    gradients are returned unchanged unless a different space is asked for.
+    """
+    if isinstance(stops, CompiledGradient):
+        if space is None or space == stops.space:
+            return stops
+        return replace(stops, space=space, table=())
+    return CompiledGradient.from_stops(list(stops), space or "rgb")
+
+
+def sample_gradient(
+    stops: GradientLike, t: float, wrap: bool = True, space: str | None = None
+) -> Tuple[int, int, int]:
     """
     Sample a color from gradient defined by ordered stops at normalized position t.
-    If wrap is True, t wraps around (mod 1).
+    If wrap is True, t wraps around (mod 1). space: 'rgb' (default), 'linear',
+    'oklab' or 'hsv'.
+
+    Pass a CompiledGradient when sampling the same stops many times.
     """
-    if wrap:
-        t = t % 1.0
+    return compile_gradient(stops, space).sample(t, wrap=wrap)
+
+
+SHIFT_MODES = ("wrap", "pingpong")
+
+
+def _check_shift_mode(shift_mode: str) -> None:
+    if shift_mode not in SHIFT_MODES:
+        raise ValueError("shift_mode must be 'wrap' or 'pingpong'")
+
+
+def _phase_for_frame(f: int, num_frames: int, shift_mode: str, shift_per_frame: float) -> float:
+    if shift_mode == "wrap":
+        return f * shift_per_frame
+    elif shift_mode == "pingpong":
+        # Go 0->1 and back 1->0 over num_frames-1 steps
+        cycle = (num_frames - 1) * 2 if num_frames > 1 else 1
+        k = f % cycle
+        up = k if k <= (num_frames - 1) else cycle - k
+        return (up / max(1, num_frames - 1))
     else:
-        t = clamp01(t)
-    s = normalize_stops(stops)
-    # Find segment
-    for i in range(1, len(s)):
-        if t <= s[i].position:
-            left = s[i - 1]
-            right = s[i]
-            span = max(1e-8, right.position - left.position)
-            local_t = (t - left.position) / span
-            return _lerp_rgb(left.color, right.color, local_t)
-    return s[-1].color
+        raise ValueError("shift_mode must be 'wrap' or 'pingpong'")
+
+
+ENGINES = ("auto", "python", "numpy")
+
+# Below this many frames x characters the NumPy setup costs more than it saves
+_NUMPY_MIN_CELLS = 2048
+
+# Frames per NumPy batch when streaming, so memory stays flat for huge frame counts
+_STREAM_CHUNK = 1024
+
+
+def _use_numpy(engine: str, cells: int) -> bool:
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+    if engine == "python":
+        return False
+    if engine == "auto" and cells < _NUMPY_MIN_CELLS:
+        return False  # don't pay the NumPy import for a job it wouldn't be used on
+    from . import vectorized
+
+    if engine == "numpy":
+        if not vectorized.HAS_NUMPY:
+            raise ImportError("engine='numpy' requires numpy to be installed")
+        return True
+    return vectorized.HAS_NUMPY and cells >= _NUMPY_MIN_CELLS
+
+
+def _wrap_period(num_frames: int, shift_per_frame: float, num_gradients: int) -> int | None:
+    """
+    Number of frames after which a wrap animation repeats exactly, or None if it does not
+    repeat within num_frames. A shift of p/q returns to the same phase every q frames,
+    and the gradient cycle repeats every num_gradients frames.
+    """
+    from fractions import Fraction
+
+    frac = Fraction(shift_per_frame).limit_denominator(num_frames)
+    if float(frac) != shift_per_frame:
+        return None
+    q = frac.denominator
+    period = q * num_gradients // gcd(q, num_gradients)
+    return period if period < num_frames else None
+
+
+# Largest lookup table resolution='auto' will build before falling back to direct sampling
+_MAX_AUTO_RESOLUTION = 1 << 16
+
+
+@lru_cache(maxsize=64)
+def rgb_table(grad: CompiledGradient, resolution: int) -> Tuple[Tuple[int, int, int], ...]:
+    """RGB of grad sampled at k / resolution, for k in 0..resolution-1."""
+    if resolution <= 0:
+        raise ValueError("resolution must be > 0")
+    sample = grad.sample
+    return tuple(sample(k / resolution) for k in range(resolution))
+
+
+@lru_cache(maxsize=64)
+def prefix_table(grad: CompiledGradient, resolution: int, codes: CodeStyle = AMPERSAND) -> Tuple[str, ...]:
+    """Color codes ('&#RRGGBB' by default) for grad sampled at k / resolution, for k in 0..resolution-1."""
+    return tuple(map(_encoder(codes), rgb_table(grad, resolution)))
+
+
+def _resolve_resolution(
+    resolution: int | str | None,
+    denom: int,
+    num_frames: int,
+    shift_mode: str,
+    shift_per_frame: float,
+) -> Tuple[int | None, int]:
+    """
+    Turn the resolution option into (table size, exact phase step). A step > 0 means every
+    sampled t lies exactly on the k / size lattice; 0 means t is rounded to the nearest step.
+    """
+    if resolution is None:
+        return None, 0
+    if resolution != "auto":
+        size = int(resolution)
+        if size <= 0:
+            raise ValueError("resolution must be > 0 or 'auto'")
+        return size, 0
+    from fractions import Fraction
+
+    # Letter positions are multiples of 1/denom; the phase is a multiple of 1/q.
+    if shift_mode == "wrap":
+        frac = Fraction(shift_per_frame).limit_denominator(_MAX_AUTO_RESOLUTION)
+        if float(frac) != shift_per_frame:
+            return None, 0
+        q = frac.denominator
+    else:
+        q = max(1, num_frames - 1)
+    size = denom * q // gcd(denom, q)
+    if size > _MAX_AUTO_RESOLUTION:
+        return None, 0
+    step = (frac.numerator * (size // q)) % size if shift_mode == "wrap" else size // q
+    # A zero shift still sits on the lattice; a step of `size` is the same as 0 mod size.
+    return size, step or size
+
+
+@dataclass(frozen=True)
+class _Animation:
+    """Validated render settings shared by the frame iterators."""
+    text: str
+    grads: Tuple[CompiledGradient, ...]
+    num_frames: int
+    shift_mode: str
+    shift_per_frame: float
+    use_numpy: bool
+    compact: bool = False
+    resolution: int | None = None  # sample through prefix_table() of this size
+    lattice_step: int = 0  # > 0: phases are exact multiples of this many table steps
+    codes: CodeStyle = AMPERSAND
+    # Character i sits at steps[i] / denom; by default i / (len(text) - 1)
+    steps: Tuple[int, ...] = ()
+    denom: int = 0
+    # Formatting codes tokenized out of the text, which then holds only the glyphs
+    styled: StyledText | None = None
+
+    def phase(self, f: int) -> float:
+        return _phase_for_frame(f, self.num_frames, self.shift_mode, self.shift_per_frame)
+
+    def units(self) -> int:
+        """Positions on the gradient: characters, or grapheme clusters."""
+        return len(self.steps) if self.steps else len(self.text)
+
+    def position_steps(self) -> Sequence[int]:
+        return self.steps or range(len(self.text))
+
+    def position_denom(self) -> int:
+        return self.denom or max(1, len(self.text) - 1)
+
+    def positions(self) -> List[float]:
+        denom = self.position_denom()
+        return [s / denom for s in self.position_steps()]
+
+    def position_indices(self) -> List[int]:
+        size = self.resolution
+        denom = self.position_denom()
+        if self.lattice_step:
+            return [s * (size // denom) for s in self.position_steps()]
+        return [round(s * size / denom) for s in self.position_steps()]
+
+    def phase_index(self, f: int) -> int:
+        size = self.resolution
+        if not self.lattice_step:
+            return round(self.phase(f) * size) % size
+        if self.shift_mode == "wrap":
+            return (f * self.lattice_step) % size
+        up = round(self.phase(f) * max(1, self.num_frames - 1))
+        return (up * self.lattice_step) % size
+
+
+def _iter_rendered(anim: _Animation, stop: int | None = None, first: int = 0) -> Iterator[str]:
+    """Render frames first..stop-1 (default: all) of the animation."""
+    text, grads, codes = anim.text, anim.grads, anim.codes
+    m = len(grads)
+    end = anim.num_frames if stop is None else stop
+    if anim.styled is not None:
+        from .formatting import iter_styled
+
+        yield from iter_styled(anim, first, end)
+        return
+    if anim.use_numpy:
+        from .vectorized import encode_frames
+
+        for rgb in _iter_color_chunks(anim, first, end):
+            yield from encode_frames(text, rgb, compact=anim.compact, codes=codes)
+        return
+    chars = codes.escape(text)
+    if anim.resolution:
+        # Positions and phases become table indices; the doubled table makes
+        # pos + offset (< 2 * size) a valid index without a modulo per character.
+        pos_idx = anim.position_indices()
+        tables = [prefix_table(g, anim.resolution, codes) * 2 for g in grads]
+        render_lut = _render_frame_lut_compact if anim.compact else _render_frame_lut
+        for f in range(first, end):
+            yield render_lut(chars, tables[f % m], pos_idx, anim.phase_index(f))
+        return
+    render = _render_frame_compact if anim.compact else _render_frame
+    encode = _encoder(codes)
+    denom = max(1, len(text) - 1)
+    for f in range(first, end):
+        yield render(chars, grads[f % m], anim.phase(f), denom, encode)
+
+
+def _iter_color_chunks(anim: _Animation, first: int, end: int) -> Iterator:
+    """NumPy frames x chars x 3 color matrices for frames first..end-1, _STREAM_CHUNK at a time."""
+    from .vectorized import indexed_colors, phase_colors
+
+    grads = anim.grads
+    m = len(grads)
+    for start in range(first, end, _STREAM_CHUNK):
+        chunk_end = min(end, start + _STREAM_CHUNK)
+        # the color functions cycle gradients from their own frame 0, so rotate to this chunk's start
+        chunk_grads = [grads[(start + k) % m] for k in range(m)]
+        if anim.resolution:
+            offsets = [anim.phase_index(f) for f in range(start, chunk_end)]
+            yield indexed_colors(chunk_grads, anim.resolution, anim.position_indices(), offsets)
+        else:
+            phases = [anim.phase(f) for f in range(start, chunk_end)]
+            yield phase_colors(anim.units(), chunk_grads, phases, anim.positions() if anim.steps else None)
+
+
+def _pingpong_reuses_first(num_frames: int, num_gradients: int) -> bool:
+    # Pingpong's last frame sits a whole gradient length (phase 1.0) past the first,
+    # which wraps to the same colors, and uses the same gradient tab.
+    return num_frames > 2 and (num_frames - 1) % num_gradients == 0
+
+
+def _distinct_frames(anim: _Animation) -> int:
+    """How many frames are rendered: output frame f repeats frame f % this."""
+    m = len(anim.grads)
+    if anim.shift_mode == "wrap":
+        period = _wrap_period(anim.num_frames, anim.shift_per_frame, m)
+        return period if period is not None else anim.num_frames
+    if _pingpong_reuses_first(anim.num_frames, m):
+        return anim.num_frames - 1  # the last frame wraps around to frame 0
+    return anim.num_frames
+
+
+def _source_frame(anim: _Animation, f: int) -> int:
+    """Index of the frame whose output frame f reuses (f itself if it is rendered)."""
+    return f % _distinct_frames(anim)
+
+
+def _iter_reusing(anim: _Animation) -> Iterator[str]:
+    """
+    Like _iter_rendered, but frames that repeat an earlier one are not rendered again:
+    the earlier string object is yielded instead.
+    """
+    return _iter_periodic(anim, lambda stop: _iter_rendered(anim, stop=stop), len)
+
+
+# Most characters of frames kept for reuse; longer periods are rendered again instead
+_MAX_KEPT_CHARS = 4 << 20
+
+
+def _iter_periodic(anim: _Animation, render: Callable[[int], Iterator[_T]], size: Callable[[_T], int]) -> Iterator[_T]:
+    """
+    All frames of anim from render(stop), which yields frames 0..stop-1. Frames are
+    yielded as they are rendered; only those that repeat later are kept (up to
+    _MAX_KEPT_CHARS), so memory stays flat even when the period is nearly num_frames.
+    """
+    rows = _distinct_frames(anim)
+    num_frames = anim.num_frames
+    keep = min(rows, num_frames - rows)  # frames rows.. repeat only these
+    kept: List[_T] | None = []
+    budget = _MAX_KEPT_CHARS
+    for frame in render(rows):
+        if kept is not None and len(kept) < keep:
+            budget -= size(frame)
+            if budget >= 0:
+                kept.append(frame)
+            else:
+                kept = None
+        yield frame
+    for start in range(rows, num_frames, rows):
+        count = min(rows, num_frames - start)
+        if kept is not None:
+            yield from kept[:count]
+        else:
+            yield from render(count)
+
+
+Encoder = Callable[[Tuple[int, int, int]], str]
+
+
+# The renderers take the text as a list of output characters (already escaped for
+# the code style) and an rgb -> code encoder.
+def _render_frame(chars: List[str], grad: CompiledGradient, phase: float, denom: int, encode: Encoder) -> str:
+    sample = grad.sample
+    parts: List[str] = []
+    for i, ch in enumerate(chars):
+        parts.append(encode(sample((i / denom) + phase)) + ch)
+    return "".join(parts)
+
+
+def _render_frame_compact(chars: List[str], grad: CompiledGradient, phase: float, denom: int, encode: Encoder) -> str:
+    # Colors persist until the next code, so only emit one when it changes, and
+    # leave whitespace uncolored (it has no visible color).
+    sample = grad.sample
+    parts: List[str] = []
+    last = None
+    for i, ch in enumerate(chars):
+        if ch.isspace():
+            parts.append(ch)
+            continue
+        rgb = sample((i / denom) + phase)
+        if rgb != last:
+            last = rgb
+            parts.append(encode(rgb))
+        parts.append(ch)
+    return "".join(parts)
+
+
+def _render_frame_lut(chars: List[str], table: Sequence[str], pos_idx: List[int], offset: int) -> str:
+    return "".join([table[p + offset] + ch for p, ch in zip(pos_idx, chars)])
+
+
+def _render_frame_lut_compact(chars: List[str], table: Sequence[str], pos_idx: List[int], offset: int) -> str:
+    parts: List[str] = []
+    last = None
+    for p, ch in zip(pos_idx, chars):
+        if not ch.isspace():
+            code = table[p + offset]
+            if code != last:
+                parts.append(code)
+                last = code
+        parts.append(ch)
+    return "".join(parts)
+
+
+def compact_bytes_saved(text: str, frame: str, codes: StyleLike = "ampersand") -> int:
+    """
+    UTF-8 bytes a compact frame of `text` saves over the fully expanded form,
+    where every character carries its own code (8 bytes for '&#RRGGBB').
+    """
+    style = get_style(codes)
+    if style is AMPERSAND:
+        # Codes are ASCII and the text is unescaped, so code points dropped == bytes dropped.
+        return 9 * len(text) - len(frame)
+    # Both forms hold the same escaped text; the rest is whole codes of equal size.
+    code_chars = len(frame) - sum(map(len, style.escape(text)))
+    width = style.width
+    return (len(text) * width - code_chars) * len(style.code((0, 0, 0)).encode("utf-8")) // width
 
 
 def per_letter_gradient_frames(
     text: str,
-    stops: List[ColorStop],
+    stops: GradientLike,
     num_frames: int,
     shift_mode: str = "wrap",  # 'wrap' or 'pingpong'
     shift_per_frame: float | None = None,
+    engine: str = "auto",  # 'auto', 'python' or 'numpy'
+    compact: bool = False,
+    resolution: int | str | None = None,
+    codes: StyleLike = "ampersand",
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
 ) -> List[str]:
     """
     Generate per-letter shifting gradient frames for the given text.
 
-    Returns a list of strings where each character is prefixed with '&#RRGGBB'.
+    Returns a list of strings where each character is prefixed with '&#RRGGBB'
+    (or another code style: 'minimessage', 'legacy', see emitters.STYLES).
+    With compact=True a code is only emitted when the color changes, and
+    whitespace gets none.
+    engine='auto' uses the NumPy renderer for larger jobs when numpy is installed;
+    both engines produce identical output.
+
+    resolution switches to table lookup: each gradient is sampled once into a
+    table of ready-made color codes and frames only index into it. Give a number of
+    steps (e.g. 4096) to round positions to that grid, or 'auto' for the exact grid
+    the text length and shift fall on (direct sampling is used if there is none).
+    Table colors can differ from direct sampling by one unit where float rounding
+    lands on a half.
+
+    space blends the stops in 'linear' RGB, 'oklab' or 'hsv' instead of plain 'rgb';
+    the gradient is converted once up front, so frames cost the same in any space.
+
+    formatting=True reads Minecraft formatting codes ('&l' bold, '&o' italic, ...,
+    '&r' reset; '§' works too) out of the text: they take no gradient position and
+    are written back in the code style around the color codes, re-applied where a
+    color code would turn them off. Whitespace gets no color code.
+
+    graphemes=True colors user-perceived characters (grapheme clusters: a letter
+    with its accents, an emoji sequence, a flag) as one unit with one code, and
+    places each by visible width, so wide CJK and emoji glyphs take two steps of
+    the gradient. The segmentation is computed once per text.
     """
     if num_frames <= 0:
         raise ValueError("num_frames must be > 0")
-    n = len(text)
-    if n == 0:
+    anim = _build_animation(
+        text, [stops], num_frames, shift_mode, shift_per_frame, engine, compact, resolution, codes, space,
+        formatting, graphemes,
+    )
+    if anim is None:
         return [""] * num_frames
+    return list(_iter_reusing(anim))
 
-    # Default shift: one character step over n frames.
-    if shift_per_frame is None:
-        shift_per_frame = 1.0 / n
-
-    # Precompute positions for letters (0..1 across text)
-    # Use (i / max(1, n-1)) to span endpoints; this gives nice edge colors.
-    denom = max(1, n - 1)
-
-    frames: List[str] = []
-
-    def phase_for_frame(f: int) -> float:
-        if shift_mode == "wrap":
-            return f * shift_per_frame
-        elif shift_mode == "pingpong":
-            # Go 0->1 and back 1->0 over num_frames-1 steps
-            cycle = (num_frames - 1) * 2 if num_frames > 1 else 1
-            k = f % cycle
-            up = k if k <= (num_frames - 1) else cycle - k
-            return (up / max(1, num_frames - 1))
-        else:
-            raise ValueError("shift_mode must be 'wrap' or 'pingpong'")
-
-    for f in range(num_frames):
-        phase = phase_for_frame(f)
-        parts: List[str] = []
-        for i, ch in enumerate(text):
-            t = (i / denom) + phase
-            rgb = sample_gradient(stops, t, wrap=True)
-            parts.append(f"&#{rgb_to_hex(rgb)}{ch}")
-        frames.append("".join(parts))
-    return frames
 
-
-def per_letter_gradient_frames_multi(
+def iter_frames(
     text: str,
-    stops_list: List[List[ColorStop]],
+    stops_list: Sequence[GradientLike],
     num_frames: int,
     shift_mode: str = "wrap",
     shift_per_frame: float | None = None,
-) -> List[str]:
+    engine: str = "auto",
+    compact: bool = False,
+    resolution: int | str | None = None,
+    codes: StyleLike = "ampersand",
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
+) -> Iterator[str]:
     """
-    Like per_letter_gradient_frames but allows 1..N gradients. For each frame f,
-    choose stops_list[f % len(stops_list)] and render. This lets you pick 1-10 gradients
-    and cycle through them across frames.
+    Streaming form of per_letter_gradient_frames_multi: yields the same frames one
+    at a time, so memory does not grow with num_frames. Arguments are validated
+    immediately; rendering happens as the iterator is consumed.
+
+    When the animation is periodic (wrap mode with a rational shift such as the
+    default 1/len(text)), only the first period is rendered and later frames are
+    the same string objects repeated.
+    """
+    anim = _build_animation(
+        text, stops_list, num_frames, shift_mode, shift_per_frame, engine, compact, resolution, codes, space,
+        formatting, graphemes,
+    )
+    if anim is None:
+        return iter([""] * max(1, num_frames))
+    return _iter_reusing(anim)
+
+
+def _build_animation(
+    text: str,
+    stops_list: Sequence[GradientLike],
+    num_frames: int,
+    shift_mode: str,
+    shift_per_frame: float | None,
+    engine: str,
+    compact: bool,
+    resolution: int | str | None,
+    codes: StyleLike = "ampersand",
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
+    steps: Sequence[int] = (),
+    denom: int = 0,
+) -> _Animation | None:
+    """
+    Validate the multi-gradient arguments; None means empty text (every frame is '').
+    steps/denom place the characters elsewhere than i / (len(text) - 1).
     """
     if not stops_list:
         raise ValueError("stops_list must contain at least one gradient")
+    style = get_style(codes)
+    styled = None
+    width = len(text)
+    if formatting or graphemes:
+        from .formatting import styled_text
+
+        styled = styled_text(text, style, formatting, graphemes)
+        text, width = styled.glyphs, styled.width
+        if styled.steps:
+            steps, denom = styled.steps, styled.denom
     n = len(text)
     if n == 0:
-        return [""] * max(1, num_frames)
+        return None
     if num_frames <= 0:
         raise ValueError("num_frames must be > 0")
+    _check_shift_mode(shift_mode)
 
     # Default shift: one character step over n frames.
     if shift_per_frame is None:
-        shift_per_frame = 1.0 / n
-
-    denom = max(1, n - 1)
-
-    def phase_for_frame(f: int) -> float:
-        if shift_mode == "wrap":
-            return f * shift_per_frame
-        elif shift_mode == "pingpong":
-            cycle = (num_frames - 1) * 2 if num_frames > 1 else 1
-            k = f % cycle
-            up = k if k <= (num_frames - 1) else cycle - k
-            return (up / max(1, num_frames - 1))
-        else:
-            raise ValueError("shift_mode must be 'wrap' or 'pingpong'")
-
-    frames: List[str] = []
-    m = len(stops_list)
-    for f in range(num_frames):
-        phase = phase_for_frame(f)
-        stops = stops_list[f % m]
-        parts: List[str] = []
-        for i, ch in enumerate(text):
-            t = (i / denom) + phase
-            rgb = sample_gradient(stops, t, wrap=True)
-            parts.append(f"&#{rgb_to_hex(rgb)}{ch}")
-        frames.append("".join(parts))
-    return frames
-
-
-def frames_to_yaml(
-    frames: List[str],
-    change_interval_ms: int = 200,
-    root_key: str = "web",
-    list_key: str = "texts",
+        shift_per_frame = 1.0 / width
+
+    if not steps:
+        denom = max(1, n - 1)
+    table_size, lattice_step = _resolve_resolution(resolution, denom, num_frames, shift_mode, shift_per_frame)
+    return _Animation(
+        text=text,
+        grads=tuple(compile_gradient(stops, space) for stops in stops_list),
+        num_frames=num_frames,
+        shift_mode=shift_mode,
+        shift_per_frame=shift_per_frame,
+        use_numpy=_use_numpy(engine, num_frames * n),
+        compact=compact,
+        resolution=table_size,
+        lattice_step=lattice_step,
+        codes=style,
+        steps=tuple(steps),
+        denom=denom if steps else 0,
+        styled=styled,
+    )
+
+
+def render_frame(
+    text: str,
+    stops_list: Sequence[GradientLike],
+    index: int,
+    num_frames: int,
+    shift_mode: str = "wrap",
+    shift_per_frame: float | None = None,
+    compact: bool = False,
+    resolution: int | str | None = None,
+    codes: StyleLike = "ampersand",
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
 ) -> str:
-    """Format frames as a YAML snippet matching the user's example."""
-    # Simple YAML emitter to avoid external deps. We'll quote each string with single quotes
-    # and escape single quotes by doubling (not typically present here), preserve &'#'.
-    lines = [f"{root_key}:", f"  change-interval: {int(change_interval_ms)}", f"  {list_key}:"]
-    for s in frames:
-        y = s.replace("'", "''")
-        lines.append(f"  - '{y}'")
-    return "\n".join(lines) + "\n"
+    """
+    Frame `index` of per_letter_gradient_frames_multi(text, stops_list, num_frames, ...),
+    computing only that frame. Cost does not depend on num_frames.
+    """
+    if not 0 <= index < max(1, num_frames):
+        raise IndexError(f"frame index {index} out of range for {num_frames} frames")
+    anim = _build_animation(
+        text, stops_list, num_frames, shift_mode, shift_per_frame, "python", compact, resolution, codes, space,
+        formatting, graphemes,
+    )
+    if anim is None:
+        return ""
+    src = _source_frame(anim, index)
+    return next(_iter_rendered(anim, stop=src + 1, first=src))
+
+
+def frame_colors(
+    text: str,
+    stops_list: Sequence[GradientLike],
+    index: int,
+    num_frames: int,
+    shift_mode: str = "wrap",
+    shift_per_frame: float | None = None,
+    resolution: int | str | None = None,
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
+) -> List[Tuple[int, int, int]]:
+    """
+    RGB of each character of text in frame `index`: the colors render_frame() would
+    encode, for callers that draw the text themselves instead of parsing codes.
+    With formatting=True the codes are not characters: colors are for the text
+    without them (formatting.split_formatting); with graphemes=True there is one
+    color per grapheme cluster (segment.grapheme_clusters).
+    """
+    if not 0 <= index < max(1, num_frames):
+        raise IndexError(f"frame index {index} out of range for {num_frames} frames")
+    anim = _build_animation(
+        text, stops_list, num_frames, shift_mode, shift_per_frame, "python", False, resolution, space=space,
+        formatting=formatting, graphemes=graphemes,
+    )
+    if anim is None:
+        return []
+    return _frame_colors(anim, _source_frame(anim, index))
+
+
+def iter_frame_colors(
+    text: str,
+    stops_list: Sequence[GradientLike],
+    num_frames: int,
+    shift_mode: str = "wrap",
+    shift_per_frame: float | None = None,
+    resolution: int | str | None = None,
+    first: int = 0,
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
+) -> Iterator[List[Tuple[int, int, int]]]:
+    """frame_colors() for frames first..num_frames-1, validating and compiling only once."""
+    anim = _build_animation(
+        text, stops_list, num_frames, shift_mode, shift_per_frame, "python", False, resolution, space=space,
+        formatting=formatting, graphemes=graphemes,
+    )
+    if anim is None:
+        return iter([[] for _ in range(first, max(1, num_frames))])
+    return (_frame_colors(anim, _source_frame(anim, f)) for f in range(first, num_frames))
+
+
+def _frame_colors(anim: _Animation, f: int) -> List[Tuple[int, int, int]]:
+    grad = anim.grads[f % len(anim.grads)]
+    if anim.resolution:
+        size = anim.resolution
+        table = rgb_table(grad, size)
+        offset = anim.phase_index(f)
+        return [table[(p + offset) % size] for p in anim.position_indices()]
+    sample = grad.sample
+    phase = anim.phase(f)
+    return [sample(t + phase) for t in anim.positions()]
+
+
+def per_letter_gradient_frames_multi(
+    text: str,
+    stops_list: Sequence[GradientLike],
+    num_frames: int,
+    shift_mode: str = "wrap",
+    shift_per_frame: float | None = None,
+    engine: str = "auto",
+    compact: bool = False,
+    resolution: int | str | None = None,
+    codes: StyleLike = "ampersand",
+    space: str | None = None,
+    formatting: bool = False,
+    graphemes: bool = False,
+) -> List[str]:
+    """
+    Like per_letter_gradient_frames but allows 1..N gradients. For each frame f,
+    choose stops_list[f % len(stops_list)] and render. This lets you pick 1-10 gradients
+    and cycle through them across frames.
+    """
+    return list(
+        iter_frames(
+            text, stops_list, num_frames, shift_mode, shift_per_frame, engine, compact, resolution, codes, space,
+            formatting, graphemes,
+        )
+    )
 
 
 __all__ = [
     "ColorStop",
+    "CompiledGradient",
+    "compile_gradient",
     "hex_to_rgb",
     "rgb_to_hex",
     "normalize_stops",
     "sample_gradient",
+    "rgb_table",
+    "prefix_table",
     "per_letter_gradient_frames",
     "per_letter_gradient_frames_multi",
+    "iter_frames",
+    "render_frame",
+    "frame_colors",
+    "iter_frame_colors",
+    "compact_bytes_saved",
     "frames_to_yaml",
+    "write_yaml",
 ]
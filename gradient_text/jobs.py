@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO
+
+from . import cache as render_cache
+from .colorspace import check_space
+from .emitters import CONTAINERS, get_style, write_frames
+from .gradient import (
+    ColorStop,
+    CompiledGradient,
+    compact_bytes_saved,
+    compile_gradient,
+    iter_frames,
+)
+
+
+MAX_GRADIENTS = 10
+
+# Preset/manifest keys and the values used when a spec leaves them out
+SPEC_DEFAULTS: Dict[str, Any] = {
+    "frames": 48,
+    "interval": 200,
+    "shift_mode": "wrap",
+    "shift_per_frame": None,
+    "root_key": "web",
+    "list_key": "texts",
+    "compact": False,
+    "resolution": None,
+    "format": "yaml",
+    "codes": "ampersand",
+    "space": "rgb",
+    "formatting": False,
+    "graphemes": False,
+}
+
+
+def stops_from_colors(colors: Sequence[str], positions: Optional[Sequence[float]] = None) -> List[ColorStop]:
+    """Stops for hex colors at the given positions, or spread evenly over 0..1."""
+    pos = list(positions or [])
+    if pos and len(pos) != len(colors):
+        raise ValueError("positions must have same length as colors")
+    if not pos:
+        if len(colors) == 1:
+            pos = [0.0]
+        else:
+            pos = [i / (len(colors) - 1) for i in range(len(colors))]
+    return [ColorStop.from_hex(p, c) for p, c in zip(pos, colors)]
+
+
+def gradients_from_data(grads_data: Sequence[Sequence[Dict[str, Any]]], space: str = "rgb") -> List[CompiledGradient]:
+    """Compile the 'gradients' list of a preset ([[{position, color}, ...], ...])."""
+    gradients: List[CompiledGradient] = []
+    for g in grads_data[:MAX_GRADIENTS]:
+        stops = []
+        for stop in g:
+            position = float(stop.get("position", 0.0))
+            color = str(stop.get("color"))
+            stops.append(ColorStop.from_hex(position, color))
+        gradients.append(compile_gradient(stops, space))
+    return gradients
+
+
+@dataclass
+class RenderResult:
+    lines: int
+    cached: bool
+    bytes_saved: int = 0  # compact mode only, and only when actually rendered
+
+
+@dataclass
+class RenderJob:
+    """One text to render: the gradients plus every setting a preset can carry."""
+    text: str
+    gradients: List[CompiledGradient] = field(default_factory=list)
+    frames: int = 48
+    interval: int = 200
+    shift_mode: str = "wrap"
+    shift_per_frame: Optional[float] = None
+    root_key: str = "web"
+    list_key: str = "texts"
+    compact: bool = False
+    resolution: int | str | None = None  # color lookup table size, 'auto', or None
+    format: str = "yaml"  # container, see emitters.CONTAINERS
+    codes: str = "ampersand"  # color code style, see emitters.STYLES
+    space: str = "rgb"  # where gradient stops are blended, see colorspace.SPACES
+    formatting: bool = False  # the text carries '&l'-style formatting codes, see formatting.py
+    graphemes: bool = False  # color grapheme clusters, placed by visible width, see segment.py
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any], base: Optional[Dict[str, Any]] = None, what: str = "job") -> "RenderJob":
+        """
+        Build a job from a preset-style dict. Missing keys come from `base`, then
+        SPEC_DEFAULTS. Besides preset 'gradients', manifests may give 'colors'
+        (one gradient) and/or 'colors_sets' (several) as lists of hex strings.
+        """
+        merged = {**SPEC_DEFAULTS, **(base or {}), **data}
+        text = merged.get("text")
+        if not text:
+            raise ValueError(f"{what} missing text")
+        space = check_space(str(merged["space"]))
+        grads_data = merged.get("gradients") or []
+        if grads_data:
+            gradients = gradients_from_data(grads_data, space)
+        else:
+            gradients = []
+            if merged.get("colors"):
+                gradients.append(compile_gradient(stops_from_colors(merged["colors"], merged.get("positions")), space))
+            for color_set in merged.get("colors_sets") or []:
+                gradients.append(compile_gradient(stops_from_colors(color_set), space))
+            gradients = gradients[:MAX_GRADIENTS]
+        if not gradients:
+            raise ValueError(f"{what} has no gradients")
+        spf = merged.get("shift_per_frame")
+        resolution = merged.get("resolution")
+        if resolution not in (None, "auto"):
+            resolution = int(resolution)
+        fmt = str(merged["format"])
+        if fmt not in CONTAINERS:
+            raise ValueError(f"{what} has unknown format '{fmt}'")
+        codes = get_style(str(merged["codes"])).name
+        return RenderJob(
+            text=str(text),
+            gradients=gradients,
+            frames=int(merged["frames"]),
+            interval=int(merged["interval"]),
+            shift_mode=str(merged["shift_mode"]),
+            shift_per_frame=None if spf is None else float(spf),
+            root_key=str(merged["root_key"]),
+            list_key=str(merged["list_key"]),
+            compact=bool(merged["compact"]),
+            resolution=resolution,
+            format=fmt,
+            codes=codes,
+            space=space,
+            formatting=bool(merged["formatting"]),
+            graphemes=bool(merged["graphemes"]),
+        )
+
+    def output_options(self) -> Dict[str, Any]:
+        return dict(change_interval_ms=max(1, self.interval), root_key=self.root_key, list_key=self.list_key)
+
+    def iter_frames(self, engine: str = "auto") -> Iterator[str]:
+        return iter_frames(
+            text=self.text,
+            stops_list=self.gradients,
+            num_frames=max(1, self.frames),
+            shift_mode=self.shift_mode,
+            shift_per_frame=self.shift_per_frame,
+            engine=engine,
+            compact=self.compact,
+            resolution=self.resolution,
+            codes=self.codes,
+            space=self.space,
+            formatting=self.formatting,
+            graphemes=self.graphemes,
+        )
+
+    def cache_key(self) -> str:
+        gradients = [compile_gradient(g, self.space) for g in self.gradients]
+        # Only recorded when on, so keys of jobs without them stay valid
+        extra = {k: True for k in ("formatting", "graphemes") if getattr(self, k)}
+        return render_cache.spec_key(
+            self.text, gradients, max(1, self.frames), self.shift_mode, self.shift_per_frame,
+            compact=self.compact, resolution=self.resolution, format=self.format, codes=self.codes,
+            **extra, **self.output_options(),
+        )
+
+
+def render_job(
+    job: RenderJob,
+    dst: TextIO,
+    use_cache: bool = True,
+    engine: str = "auto",
+    max_bytes: int = render_cache.DEFAULT_MAX_BYTES,
+) -> RenderResult:
+    """
+    Stream the job's output (YAML unless job.format says otherwise) to dst. With use_cache, unchanged specs are copied from the
+    render cache and new renders are added to it.
+    """
+    saved = [0]
+
+    def frames() -> Iterator[str]:
+        it = job.iter_frames(engine)
+        # The savings count assumes every character of the text carries a code, which formatting
+        # and grapheme clusters break
+        tally = job.compact and not (job.formatting or job.graphemes)
+        return _tally_savings(job.text, it, saved, job.codes) if tally else it
+
+    if not use_cache:
+        counter = _LineCounter(dst)
+        write_frames(frames(), counter, job.format, **job.output_options())
+        return RenderResult(lines=counter.lines, cached=False, bytes_saved=saved[0])
+
+    # Only touch the renderer (and NumPy) on a cache miss
+    key = job.cache_key()
+    path = render_cache.lookup(key)
+    cached = path is not None
+    if path is None:
+        path = render_cache.store(
+            key, lambda f: write_frames(frames(), f, job.format, **job.output_options()), max_bytes=max_bytes
+        )
+    try:
+        src = open(path, "r", encoding="utf-8", newline="")
+    except FileNotFoundError:
+        # Evicted by another process after the lookup (or store): render without the cache
+        return render_job(job, dst, use_cache=False, engine=engine)
+    lines = 0
+    with src:
+        for line in src:
+            dst.write(line)
+            lines += 1
+    return RenderResult(lines=lines, cached=cached, bytes_saved=saved[0])
+
+
+def _tally_savings(text: str, frames: Iterator[str], saved: List[int], codes: str) -> Iterator[str]:
+    for frame in frames:
+        saved[0] += compact_bytes_saved(text, frame, codes)
+        yield frame
+
+
+class _LineCounter:
+    """Pass-through writer counting the lines written (containers differ in framing lines)."""
+
+    def __init__(self, dst: TextIO):
+        self._dst = dst
+        self.lines = 0
+
+    def write(self, s: str) -> int:
+        self.lines += s.count("\n")
+        return self._dst.write(s)
+
+
+__all__ = [
+    "MAX_GRADIENTS",
+    "SPEC_DEFAULTS",
+    "stops_from_colors",
+    "gradients_from_data",
+    "RenderJob",
+    "RenderResult",
+    "render_job",
+]
@@ -2,12 +2,41 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: lock a byte of the lock file with msvcrt instead
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
 
 
 APP_DIR_NAME = "gradient_text"
-PRESETS_FILE = "presets.json"
+PRESETS_FILE = "presets.json"  # legacy single-file store, migrated on first use
+
+# The store is an append-only log of JSON records plus a small index of
+# "<offset> <length> <name>" lines pointing at each preset's latest record.
+# Readers parse only the index; a lookup is one seek + one record. Writers append
+# a record, then its index line, so the index never points at incomplete data.
+INDEX_FILE = "presets.idx"
+INDEX_MAGIC = "gradient_text-presets"
+INDEX_VERSION = 1
+LOG_PREFIX = "presets."
+LOG_SUFFIX = ".jsonl"
+
+# Writers (put/delete/save/compact/migrate) hold an advisory lock on this file, so
+# concurrent processes never interleave their read-modify-write. Readers take no
+# lock: appends are ordered record-then-index-line and rewrites go through
+# os.replace, so a reader sees either the old or the new state, never a mix.
+LOCK_FILE = "presets.lock"
+_READ_RETRIES = 5
+
+# Rewrite the log once superseded/deleted records outweigh live ones by this much
+_COMPACT_MIN_DEAD_BYTES = 256 * 1024
 
 
 def _presets_dir() -> Path:
@@ -22,10 +51,182 @@ def _presets_dir() -> Path:
 
 
 def presets_path() -> Path:
+    """Path of the legacy presets.json file."""
     return _presets_dir() / PRESETS_FILE
 
 
-def load_presets() -> Dict[str, Any]:
+def index_path() -> Path:
+    return _presets_dir() / INDEX_FILE
+
+
+@dataclass
+class _Index:
+    """
+    In-process view of the index file, refreshed incrementally as it grows. Never
+    changed once published in _cached: threads share it, so a refresh parses into a copy.
+    """
+    path: Path
+    log_name: str = ""
+    generation: int = 0
+    entries: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    live_bytes: int = 0  # log bytes of the records entries point at
+    consumed: int = 0  # index bytes parsed so far
+    stat_key: Tuple[int, int, int] = (0, 0, 0)  # (inode, size, mtime_ns) when last parsed
+
+    @property
+    def log_path(self) -> Path:
+        return self.path.parent / self.log_name
+
+
+_cached: Optional[_Index] = None
+
+
+_lock_guard = threading.RLock()
+_lock_depth = 0
+_lock_file = None
+
+
+@contextmanager
+def _locked() -> Iterator[None]:
+    """Hold the store's inter-process write lock (re-entrant within a process)."""
+    global _lock_depth, _lock_file
+    with _lock_guard:
+        if _lock_depth == 0:
+            f = open(_presets_dir() / LOCK_FILE, "a+b")
+            try:
+                _acquire(f)
+            except BaseException:
+                f.close()
+                raise
+            _lock_file = f
+        _lock_depth += 1
+        try:
+            yield
+        finally:
+            _lock_depth -= 1
+            if _lock_depth == 0:
+                f, _lock_file = _lock_file, None
+                _release(f)
+                f.close()
+
+
+def _acquire(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # gives up after ~10 s
+            return
+        except OSError:
+            continue
+
+
+def _release(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _stat_key(st: os.stat_result) -> Tuple[int, int, int]:
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _parse_header(line: bytes) -> Tuple[str, int]:
+    parts = line.decode("utf-8").split()
+    if len(parts) != 4 or parts[0] != INDEX_MAGIC or int(parts[1]) != INDEX_VERSION:
+        raise ValueError("unrecognized preset index header")
+    return parts[3], int(parts[2])
+
+
+def _read_index() -> _Index:
+    """
+    Current index, reusing the cached one when the file is unchanged (same mtime and
+    size) and parsing only the appended tail when it has grown. Safe to call from
+    several threads: each builds its own index, and the last one finished is cached.
+    """
+    global _cached
+    path = index_path()
+    if not path.exists():
+        with _locked():
+            if not path.exists():
+                _migrate()
+    st = path.stat()
+    key = _stat_key(st)
+    idx = _cached
+    if idx is not None and idx.path == path and idx.stat_key == key:
+        return idx
+    with open(path, "rb") as f:
+        if idx is not None and (idx.path != path or st.st_size < idx.consumed
+                                or _parse_header(f.readline()) != (idx.log_name, idx.generation)):
+            idx = None
+        if idx is None:
+            idx = _Index(path=path)  # new or replaced (compacted) index: parse from the start
+        else:
+            idx = replace(idx, entries=dict(idx.entries))
+        f.seek(idx.consumed)
+        data = f.read()
+    end = data.rfind(b"\n") + 1  # a trailing partial line is still being written
+    for line in data[:end].splitlines():
+        if idx.consumed == 0 and not idx.log_name:
+            idx.log_name, idx.generation = _parse_header(line)
+            continue
+        offset, length, name = line.decode("utf-8").split(" ", 2)
+        name = json.loads(name)
+        old = idx.entries.get(name)
+        if old is not None:
+            idx.live_bytes -= old[1]
+        if int(length):
+            idx.entries[name] = (int(offset), int(length))
+            idx.live_bytes += int(length)
+        elif old is not None:
+            del idx.entries[name]
+    idx.consumed += end
+    idx.stat_key = key
+    _cached = idx
+    return idx
+
+
+def _index_line(name: str, offset: int, length: int) -> bytes:
+    return f"{offset} {length} {json.dumps(name)}\n".encode("utf-8")
+
+
+def _record(name: str, preset: Optional[Dict[str, Any]]) -> bytes:
+    return (json.dumps({"name": name, "preset": preset}, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _write_store(presets: Dict[str, Dict[str, Any]], generation: int) -> None:
+    """Write a fresh log holding only `presets` and atomically switch the index to it."""
+    import tempfile  # rewrites are rare; readers shouldn't pay for this import
+    d = _presets_dir()
+    log_name = f"{LOG_PREFIX}{generation}{LOG_SUFFIX}"
+    index_lines = [f"{INDEX_MAGIC} {INDEX_VERSION} {generation} {log_name}\n".encode("utf-8")]
+    offset = 0
+    fd, tmp_log = tempfile.mkstemp(dir=d, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        for name, preset in presets.items():
+            rec = _record(name, preset)
+            f.write(rec)
+            index_lines.append(_index_line(name, offset, len(rec)))
+            offset += len(rec)
+    os.replace(tmp_log, d / log_name)
+    fd, tmp_idx = tempfile.mkstemp(dir=d, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(b"".join(index_lines))
+    os.replace(tmp_idx, d / INDEX_FILE)
+    # Older logs are no longer referenced; a reader still holding one retries on the new index
+    for p in d.glob(f"{LOG_PREFIX}*{LOG_SUFFIX}"):
+        if p.name != log_name:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+
+def _load_legacy() -> Dict[str, Any]:
     path = presets_path()
     if not path.exists():
         return {"version": 1, "presets": {}}
@@ -43,32 +244,121 @@ def load_presets() -> Dict[str, Any]:
         return {"version": 1, "presets": {}}
 
 
+def _log_generation(path: Path) -> int:
+    try:
+        return int(path.name[len(LOG_PREFIX):-len(LOG_SUFFIX)])
+    except ValueError:
+        return -1
+
+
+def _replay_log(path: Path) -> Dict[str, Dict[str, Any]]:
+    presets: Dict[str, Dict[str, Any]] = {}
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # torn final write
+            rec = json.loads(line)
+            if rec["preset"] is None:
+                presets.pop(rec["name"], None)
+            else:
+                presets[rec["name"]] = rec["preset"]
+    return presets
+
+
+def _migrate() -> None:
+    """
+    Create the index: rebuilt from the newest log if the index file was lost,
+    otherwise a new store importing presets.json if there is one.
+    """
+    logs = sorted(_presets_dir().glob(f"{LOG_PREFIX}*{LOG_SUFFIX}"), key=_log_generation)
+    if logs and _log_generation(logs[-1]) >= 0:
+        _write_store(_replay_log(logs[-1]), generation=_log_generation(logs[-1]) + 1)
+        return
+    legacy = presets_path()
+    _write_store(_load_legacy()["presets"], generation=1)
+    if legacy.exists():
+        # Kept (renamed) so older versions' data is not lost, but never imported twice
+        os.replace(legacy, legacy.with_name(PRESETS_FILE + ".migrated"))
+
+
+def _read_record(idx: _Index, name: str) -> Optional[Dict[str, Any]]:
+    loc = idx.entries.get(name)
+    if loc is None:
+        return None
+    offset, length = loc
+    with open(idx.log_path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.read(length))["preset"]
+
+
+def _append(name: str, preset: Optional[Dict[str, Any]]) -> None:
+    """Append an update (or, with preset=None, a deletion) for name."""
+    rec = _record(name, preset)
+    with _locked():
+        idx = _read_index()
+        if preset is None and name not in idx.entries:
+            return
+        # Deletions are logged too, so the log alone is enough to rebuild a lost index
+        with open(idx.log_path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(rec)
+        with open(idx.path, "ab") as f:
+            f.write(_index_line(name, offset, len(rec) if preset is not None else 0))
+        idx = _read_index()
+        dead = idx.log_path.stat().st_size - idx.live_bytes
+        if dead > max(_COMPACT_MIN_DEAD_BYTES, idx.live_bytes):
+            compact()
+
+
+def compact() -> None:
+    """Rewrite the store without superseded or deleted records."""
+    with _locked():
+        idx = _read_index()
+        _write_store(load_presets()["presets"], generation=idx.generation + 1)
+
+
+def _read_current(read: Callable[[_Index], Any]) -> Any:
+    """Run read(index); if a concurrent compaction removed its log, retry on the new index."""
+    for attempt in range(_READ_RETRIES):
+        try:
+            return read(_read_index())
+        except FileNotFoundError:
+            if attempt == _READ_RETRIES - 1:
+                raise
+
+
+def _read_all(idx: _Index) -> Dict[str, Any]:
+    presets: Dict[str, Any] = {}
+    with open(idx.log_path, "rb") as f:
+        for name, (offset, length) in idx.entries.items():
+            f.seek(offset)
+            presets[name] = json.loads(f.read(length))["preset"]
+    return presets
+
+
+def load_presets() -> Dict[str, Any]:
+    """Every preset, as {"version": 1, "presets": {name: preset}}. Prefer get_preset for one."""
+    return {"version": 1, "presets": _read_current(_read_all)}
+
+
 def save_presets(data: Dict[str, Any]) -> None:
-    path = presets_path()
-    tmp = path.with_suffix(".tmp")
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-    os.replace(tmp, path)
+    """Replace the whole store with data["presets"]."""
+    with _locked():
+        idx = _read_index()
+        _write_store(dict(data.get("presets", {})), generation=idx.generation + 1)
 
 
 def list_preset_names() -> List[str]:
-    return sorted(load_presets().get("presets", {}).keys())
+    return sorted(_read_index().entries)
 
 
 def get_preset(name: str) -> Optional[Dict[str, Any]]:
-    data = load_presets()
-    return data.get("presets", {}).get(name)
+    return _read_current(lambda idx: _read_record(idx, name))
 
 
 def put_preset(name: str, preset: Dict[str, Any]) -> None:
-    data = load_presets()
-    data.setdefault("presets", {})[name] = preset
-    save_presets(data)
+    _append(name, preset)
 
 
 def delete_preset(name: str) -> None:
-    data = load_presets()
-    if name in data.get("presets", {}):
-        del data["presets"][name]
-        save_presets(data)
-
+    _append(name, None)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Tuple
+
+# Extended grapheme clusters (Unicode UAX #29) from the standard library's
+# character database. Covers what shows up in server names: combining marks,
+# spacing marks, variation selectors, emoji modifiers, tags and ZWJ sequences,
+# flag pairs, Hangul jamo and CR LF. Prepend characters are not handled.
+
+_ZWJ = "\u200d"
+_ZWNJ = "\u200c"
+
+
+def _is_control(ch: str) -> bool:
+    return ch not in (_ZWJ, _ZWNJ) and unicodedata.category(ch) in ("Cc", "Zl", "Zp", "Cs")
+
+
+def _is_extend(ch: str) -> bool:
+    cp = ord(ch)
+    return (
+        unicodedata.category(ch) in ("Mn", "Me", "Mc")
+        or ch in (_ZWJ, _ZWNJ)
+        or 0x1F3FB <= cp <= 0x1F3FF  # emoji skin tone modifiers
+        or 0xE0020 <= cp <= 0xE007F  # tag characters (subdivision flags)
+    )
+
+
+def _is_regional_indicator(ch: str) -> bool:
+    return 0x1F1E6 <= ord(ch) <= 0x1F1FF
+
+
+def _is_pictographic(ch: str) -> bool:
+    # Approximates Extended_Pictographic by the blocks it covers
+    cp = ord(ch)
+    return (
+        0x1F000 <= cp <= 0x1FAFF
+        or 0x2600 <= cp <= 0x27BF
+        or 0x2300 <= cp <= 0x23FF
+        or 0x2B00 <= cp <= 0x2BFF
+        or cp in (0x00A9, 0x00AE, 0x203C, 0x2049, 0x2122, 0x2139, 0x3030, 0x303D, 0x3297, 0x3299)
+    )
+
+
+def _hangul_type(ch: str) -> str:
+    cp = ord(ch)
+    if 0x1100 <= cp <= 0x115F or 0xA960 <= cp <= 0xA97C:
+        return "L"
+    if 0x1160 <= cp <= 0x11A7 or 0xD7B0 <= cp <= 0xD7C6:
+        return "V"
+    if 0x11A8 <= cp <= 0x11FF or 0xD7CB <= cp <= 0xD7FB:
+        return "T"
+    if 0xAC00 <= cp <= 0xD7A3:
+        return "LV" if (cp - 0xAC00) % 28 == 0 else "LVT"
+    return ""
+
+
+_HANGUL_JOINS = {
+    "L": ("L", "V", "LV", "LVT"),
+    "LV": ("V", "T"),
+    "V": ("V", "T"),
+    "LVT": ("T",),
+    "T": ("T",),
+}
+
+
+def _joins(cluster: str, prev: str, ch: str, ri_count: int) -> bool:
+    """Whether ch continues the cluster whose last character is prev."""
+    if prev == "\r" and ch == "\n":
+        return True
+    if _is_control(prev) or _is_control(ch):
+        return False
+    hangul = _hangul_type(ch)
+    if hangul and hangul in _HANGUL_JOINS.get(_hangul_type(prev), ()):
+        return True
+    if _is_extend(ch):
+        return True
+    if prev == _ZWJ and _is_pictographic(ch) and _is_pictographic(cluster[0]):
+        return True
+    # Flags are pairs of regional indicators
+    return _is_regional_indicator(prev) and _is_regional_indicator(ch) and ri_count % 2 == 1
+
+
+@lru_cache(maxsize=256)
+def grapheme_clusters(text: str) -> Tuple[str, ...]:
+    """text split into user-perceived characters, e.g. 'e' + U+0301 stays one."""
+    clusters = []
+    cluster = ""
+    ri_count = 0  # regional indicators in the current run
+    for ch in text:
+        if cluster and _joins(cluster, cluster[-1], ch, ri_count):
+            cluster += ch
+        else:
+            if cluster:
+                clusters.append(cluster)
+            cluster = ch
+            ri_count = 0
+        ri_count = ri_count + 1 if _is_regional_indicator(ch) else 0
+    if cluster:
+        clusters.append(cluster)
+    return tuple(clusters)
+
+
+def cluster_width(cluster: str) -> int:
+    """Columns a cluster occupies: 2 for wide (CJK, emoji) glyphs, else 1."""
+    base = cluster[0]
+    if unicodedata.east_asian_width(base) in ("W", "F"):
+        return 2
+    if "\ufe0f" in cluster or _is_regional_indicator(base):
+        return 2  # emoji presentation, flags
+    return 1
+
+
+@lru_cache(maxsize=256)
+def cluster_columns(text: str) -> Tuple[Tuple[int, ...], int]:
+    """(starting column of each grapheme cluster, total columns) for text."""
+    columns = []
+    col = 0
+    for cluster in grapheme_clusters(text):
+        columns.append(col)
+        col += cluster_width(cluster)
+    return tuple(columns), col
+
+
+__all__ = [
+    "grapheme_clusters",
+    "cluster_width",
+    "cluster_columns",
+]
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from . import presets as presets_mgr
+from .jobs import RenderJob, render_job
+
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+MAX_REQUEST_BYTES = 1024 * 1024
+# Latency percentiles and recent throughput are computed over this many requests
+STATS_WINDOW = 4096
+
+CONTENT_TYPES = {
+    "yaml": "application/yaml; charset=utf-8",
+    "json": "application/json; charset=utf-8",
+    "lines": "text/plain; charset=utf-8",
+}
+
+
+class _Pending:
+    """A render in progress; identical requests arriving meanwhile wait on it."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.body: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+@dataclass
+class Rendered:
+    body: bytes
+    content_type: str
+    source: str  # 'hit', 'miss' or 'coalesced'
+
+
+class RenderService:
+    """
+    Renders generation specs with an in-memory LRU of recent outputs. Concurrent
+    requests for the same spec are coalesced: one renders, the others wait for it.
+    Thread-safe; the HTTP handler calls render() from many threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        engine: str = "auto",
+        use_disk_cache: bool = False,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.engine = engine
+        self.use_disk_cache = use_disk_cache
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lru_bytes = 0
+        self._inflight: Dict[str, _Pending] = {}
+        self._started = time.time()
+        self._counts = {"requests": 0, "hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+        self._recent: Deque[Tuple[float, float]] = deque(maxlen=STATS_WINDOW)  # (finished at, ms)
+
+    def job_for(self, spec: Dict[str, Any]) -> RenderJob:
+        """The job for a request body: a preset-style spec, optionally starting from "preset"."""
+        if not isinstance(spec, dict):
+            raise ValueError("request body must be a JSON object")
+        spec = dict(spec)
+        preset_name = spec.pop("preset", None)
+        if preset_name:
+            base = presets_mgr.get_preset(str(preset_name))
+            if not base:
+                raise ValueError(f"preset '{preset_name}' not found")
+            spec = {**base, **spec}
+        return RenderJob.from_dict(spec, what="request")
+
+    def render(self, spec: Dict[str, Any]) -> Rendered:
+        start = time.perf_counter()
+        try:
+            job = self.job_for(spec)
+            body, source = self._render_job(job)
+        except Exception:
+            self._record("errors", start)
+            raise
+        self._record({"hit": "hits", "miss": "misses", "coalesced": "coalesced"}[source], start)
+        return Rendered(body=body, content_type=CONTENT_TYPES.get(job.format, CONTENT_TYPES["lines"]), source=source)
+
+    def _render_job(self, job: RenderJob) -> Tuple[bytes, str]:
+        key = job.cache_key()
+        with self._lock:
+            body = self._lru.get(key)
+            if body is not None:
+                self._lru.move_to_end(key)
+                return body, "hit"
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = _Pending()
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.body, "coalesced"
+        try:
+            buf = io.StringIO()
+            render_job(job, buf, use_cache=self.use_disk_cache, engine=self.engine)
+            pending.body = buf.getvalue().encode("utf-8")
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                if pending.body is not None:
+                    self._remember(key, pending.body)
+            pending.done.set()
+        return pending.body, "miss"
+
+    def _remember(self, key: str, body: bytes) -> None:
+        # Caller holds self._lock
+        if len(body) > self.max_bytes:
+            return
+        self._lru[key] = body
+        self._lru_bytes += len(body)
+        while len(self._lru) > self.max_entries or self._lru_bytes > self.max_bytes:
+            _old, dropped = self._lru.popitem(last=False)
+            self._lru_bytes -= len(dropped)
+
+    def _record(self, outcome: str, start: float) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts[outcome] += 1
+            self._recent.append((now, (now - start) * 1000))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            recent = list(self._recent)
+            entries, size, inflight = len(self._lru), self._lru_bytes, len(self._inflight)
+        uptime = time.time() - self._started
+        latencies = sorted(ms for _t, ms in recent)
+
+        def pct(p: float) -> float:
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3) if latencies else 0.0
+
+        span = recent[-1][0] - recent[0][0] if len(recent) > 1 else 0.0
+        return {
+            **counts,
+            "in_flight": inflight,
+            "uptime_s": round(uptime, 3),
+            "requests_per_s": round(counts["requests"] / uptime, 3) if uptime else 0.0,
+            "recent_requests_per_s": round((len(recent) - 1) / span, 3) if span else 0.0,
+            "latency_ms": {
+                "window": len(latencies),
+                "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+                "p50": pct(0.50),
+                "p90": pct(0.90),
+                "p99": pct(0.99),
+                "max": round(latencies[-1], 3) if latencies else 0.0,
+            },
+            "lru": {"entries": entries, "bytes": size, "max_entries": self.max_entries, "max_bytes": self.max_bytes},
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "RenderServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        if self.path.split("?", 1)[0] != "/render":
+            self._send_json(404, {"error": "not found"})
+            return
+        header = self.headers.get("Content-Length")
+        try:
+            length = int(header) if header is not None else -1
+        except ValueError:
+            length = -1
+        if header is None or length < 0 or length > MAX_REQUEST_BYTES:
+            # The body can't be read (or skipped) safely, so this connection ends here
+            self.close_connection = True
+            if header is None:
+                self._send_json(411, {"error": "Content-Length required"})
+            elif length < 0:
+                self._send_json(400, {"error": f"invalid Content-Length {header!r}"})
+            else:
+                self._send_json(413, {"error": "request too large"})
+            return
+        try:
+            spec = json.loads(self.rfile.read(length) or b"{}")
+            result = self.server.service.render(spec)
+        except (ValueError, TypeError, KeyError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send(200, result.body, result.content_type, {"X-Render-Cache": result.source})
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        if path == "/stats":
+            self._send_json(200, self.server.service.stats())
+        elif path == "/health":
+            self._send_json(200, {"ok": True})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _send_json(self, status: int, data: Dict[str, Any]) -> None:
+        self._send(status, json.dumps(data).encode("utf-8"), CONTENT_TYPES["json"])
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class RenderServer(ThreadingHTTPServer):
+    """
+    HTTP front end for a RenderService:
+      POST /render   body: JSON spec (preset keys, "colors"/"colors_sets", optional "preset",
+                     "format", "codes"); response: the rendered output
+      GET  /stats    counters, LRU usage, latency percentiles and throughput as JSON
+      GET  /health
+    """
+    daemon_threads = True
+    # socketserver's default backlog of 5 makes bursts of clients wait on SYN retries
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], service: Optional[RenderService] = None, verbose: bool = False):
+        super().__init__(address, _Handler)
+        self.service = service or RenderService()
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    service: Optional[RenderService] = None,
+    verbose: bool = False,
+    ready: Optional[threading.Event] = None,
+) -> None:
+    """Run a RenderServer until interrupted. Port 0 picks a free port."""
+    with RenderServer((host, port), service, verbose) as httpd:
+        if ready is not None:
+            ready.set()
+        httpd.serve_forever()
+
+
+__all__ = [
+    "DEFAULT_PORT",
+    "RenderService",
+    "RenderServer",
+    "Rendered",
+    "serve",
+]
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; gradient.py falls back to the pure-Python loop
+    np = None  # type: ignore[assignment]
+
+from .colorspace import DENSE_STEPS
+from .emitters import AMPERSAND, CodeStyle
+from .gradient import CompiledGradient
+
+
+HAS_NUMPY = np is not None
+
+# ASCII codes for '0'..'F', indexed by nibble value
+_HEX_DIGITS = b"0123456789ABCDEF"
+
+
+def color_matrix(grad: CompiledGradient, t):
+    """
+    Sample `grad` at every position in the float array `t` (wrapping mod 1).
+
+    Returns a uint8 array of shape t.shape + (3,). Uses the same float operations
+    and half-to-even rounding as CompiledGradient.sample, so results are identical.
+    """
+    t = np.mod(np.asarray(t, dtype=np.float64), 1.0)
+    if grad.table:
+        # Same index as CompiledGradient.sample: int(t * DENSE_STEPS + 0.5)
+        idx = np.floor(t * DENSE_STEPS + 0.5).astype(np.intp)
+        return _dense_array(grad)[idx]
+    pos = np.asarray(grad.positions, dtype=np.float64)
+    cols = np.asarray(grad.colors, dtype=np.float64)
+    last = len(pos) - 1
+    # bisect_left(pos, t, lo=1)
+    idx = np.searchsorted(pos[1:], t, side="left") + 1
+    past_end = idx > last
+    idx = np.minimum(idx, last)
+    left = pos[idx - 1]
+    span = np.maximum(1e-8, pos[idx] - left)
+    local_t = (t - left) / span
+    a = cols[idx - 1]
+    b = cols[idx]
+    rgb = np.rint(a + (b - a) * local_t[..., None])
+    if past_end.any():
+        rgb[past_end] = cols[last]
+    return rgb.astype(np.uint8)
+
+
+def encode_frames(text: str, rgb, compact: bool = False, codes: CodeStyle = AMPERSAND) -> List[str]:
+    """
+    Turn a frames x chars x 3 color matrix into '&#RRGGBB<char>' strings (or the
+    given code style's equivalent).
+
+    All frames are written into one byte matrix: the characters are laid down once
+    as a template row and the hex digits are filled column-wise from a lookup table.
+    With compact=True the codes of whitespace and of characters repeating the
+    previous color are masked out before the rows are decoded.
+    """
+    num_frames = rgb.shape[0]
+    code, digits = codes.template()
+    code_len = len(code)
+    encoded = [ch.encode("utf-8", "surrogatepass") for ch in codes.escape(text)]
+    widths = np.array([code_len + len(b) for b in encoded], dtype=np.intp)
+    offsets = np.zeros(len(encoded), dtype=np.intp)
+    np.cumsum(widths[:-1], out=offsets[1:])
+    row_len = int(widths.sum())
+
+    template = bytearray()
+    for b in encoded:
+        template += code + b
+    row = np.frombuffer(bytes(template), dtype=np.uint8)
+
+    out = np.empty((num_frames, row_len), dtype=np.uint8)
+    out[:] = row
+    hex_lut = np.frombuffer(_HEX_DIGITS, dtype=np.uint8)
+    for c in range(3):
+        channel = rgb[:, :, c]
+        out[:, offsets + digits[2 * c]] = hex_lut[channel >> 4]
+        out[:, offsets + digits[2 * c + 1]] = hex_lut[channel & 0x0F]
+
+    if not compact:
+        buf = out.tobytes()
+        return [
+            buf[k * row_len:(k + 1) * row_len].decode("utf-8", "surrogatepass")
+            for k in range(num_frames)
+        ]
+
+    emit = np.zeros((num_frames, len(text)), dtype=bool)
+    visible = np.array([not ch.isspace() for ch in text], dtype=bool)
+    cols = np.flatnonzero(visible)
+    if len(cols):
+        packed = (rgb[:, cols, 0].astype(np.uint32) << 16) | (rgb[:, cols, 1].astype(np.uint32) << 8) | rgb[:, cols, 2]
+        changed = np.ones(packed.shape, dtype=bool)
+        changed[:, 1:] = packed[:, 1:] != packed[:, :-1]
+        emit[:, cols] = changed
+    keep = np.ones((num_frames, row_len), dtype=bool)
+    code_cols = (offsets[:, None] + np.arange(code_len)).ravel()
+    keep[:, code_cols] = np.repeat(emit, code_len, axis=1)
+    buf = out[keep].tobytes()
+    ends = np.cumsum(keep.sum(axis=1)).tolist()
+    frames: List[str] = []
+    start = 0
+    for end in ends:
+        frames.append(buf[start:end].decode("utf-8", "surrogatepass"))
+        start = end
+    return frames
+
+
+def phase_colors(
+    n: int,
+    grads: Sequence[CompiledGradient],
+    phases: Sequence[float],
+    positions: Sequence[float] | None = None,
+):
+    """
+    Frame f of the frames x n x 3 color matrix uses grads[f % len(grads)] shifted
+    by phases[f]. Character i sits at positions[i] (default i / (n - 1)) before the
+    phase is added.
+    """
+    if not HAS_NUMPY:
+        raise ImportError("numpy is required for the vectorized engine")
+    num_frames = len(phases)
+    if positions is None:
+        base = np.arange(n, dtype=np.float64) / max(1, n - 1)
+    else:
+        base = np.asarray(positions, dtype=np.float64)
+    phase_arr = np.asarray(phases, dtype=np.float64)
+    rgb = np.empty((num_frames, n, 3), dtype=np.uint8)
+    m = len(grads)
+    for gi, grad in enumerate(grads):
+        rows = slice(gi, num_frames, m)
+        t = base[None, :] + phase_arr[rows, None]
+        rgb[rows] = color_matrix(grad, t)
+    return rgb
+
+
+def color_table(grad: CompiledGradient, resolution: int):
+    """grad sampled at k / resolution for k in 0..resolution-1, as a (resolution, 3) uint8 array."""
+    return color_matrix(grad, np.arange(resolution, dtype=np.float64) / resolution)
+
+
+def indexed_colors(
+    grads: Sequence[CompiledGradient],
+    resolution: int,
+    position_indices: Sequence[int],
+    offsets: Sequence[int],
+):
+    """
+    Table-lookup counterpart of phase_colors: frame f, character i takes entry
+    (position_indices[i] + offsets[f]) % resolution of its gradient's color table.
+    """
+    if not HAS_NUMPY:
+        raise ImportError("numpy is required for the vectorized engine")
+    num_frames = len(offsets)
+    idx = (np.asarray(position_indices, dtype=np.int64)[None, :]
+           + np.asarray(offsets, dtype=np.int64)[:, None]) % resolution
+    rgb = np.empty(idx.shape + (3,), dtype=np.uint8)
+    m = len(grads)
+    for gi, grad in enumerate(grads):
+        rows = slice(gi, num_frames, m)
+        rgb[rows] = _cached_color_table(grad, resolution)[idx[rows]]
+    return rgb
+
+
+@lru_cache(maxsize=64)
+def _dense_array(grad: CompiledGradient):
+    """grad.table (a non-rgb gradient's dense samples) as a uint8 array."""
+    return np.asarray(grad.table, dtype=np.uint8)
+
+
+@lru_cache(maxsize=64)
+def _cached_color_table(grad: CompiledGradient, resolution: int):
+    return color_table(grad, resolution)
+
+
+__all__ = [
+    "HAS_NUMPY",
+    "color_matrix",
+    "color_table",
+    "encode_frames",
+    "phase_colors",
+    "indexed_colors",
+]
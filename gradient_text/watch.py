@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import cache as render_cache
+from .batch import BatchResult, _file_stamp, _plan, render_to_file
+from .jobs import RenderJob
+
+
+# Input files are only stat()ed between renders, so a short poll costs next to nothing
+DEFAULT_POLL_SECONDS = 0.05
+
+
+def _signature(paths: Sequence[str]) -> Tuple[Any, ...]:
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            sig.append((p, st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append((p, None, None))
+    return tuple(sig)
+
+
+def _spec_key(spec: Dict[str, Any]) -> str:
+    return json.dumps(spec, sort_keys=True, default=str)
+
+
+class Watcher:
+    """
+    Keeps rendered outputs in step with a set of manifest-style entries. refresh()
+    re-renders only entries whose spec changed (or whose output file was changed or
+    removed by someone else) since this watcher last wrote it.
+    """
+
+    def __init__(
+        self,
+        out_dir: str = ".",
+        use_cache: bool = True,
+        engine: str = "auto",
+        max_bytes: int = render_cache.DEFAULT_MAX_BYTES,
+    ):
+        self.out_dir = out_dir
+        self.use_cache = use_cache
+        self.engine = engine
+        self.max_bytes = max_bytes
+        # out path -> (spec key, [size, mtime_ns]) of the last successful write
+        self._written: Dict[str, Tuple[str, List[int]]] = {}
+
+    def refresh(self, entries: List[Dict[str, Any]]) -> List[BatchResult]:
+        """Render the entries that changed; returns their results (unchanged ones are left out)."""
+        results = []
+        for name, out, spec, error in _plan(entries, self.out_dir):
+            if error:
+                results.append(BatchResult(name=name, out=out, ok=False, seconds=0.0, error=error))
+                continue
+            key = _spec_key(spec)
+            if self._written.get(out) == (key, _file_stamp(out)):
+                continue
+            start = time.perf_counter()
+            try:
+                job = RenderJob.from_dict(spec, what=name)
+                result = render_to_file(job, out, self.use_cache, self.engine, self.max_bytes)
+            except Exception as e:
+                self._written.pop(out, None)
+                results.append(BatchResult(name=name, out=out, ok=False, seconds=time.perf_counter() - start, error=str(e)))
+                continue
+            self._written[out] = (key, _file_stamp(out))
+            results.append(BatchResult(
+                name=name, out=out, ok=True, seconds=time.perf_counter() - start,
+                lines=result.lines, cached=result.cached,
+            ))
+        return results
+
+    def run(
+        self,
+        load: Callable[[], List[Dict[str, Any]]],
+        inputs: Callable[[], Sequence[str]],
+        report: Callable[[List[BatchResult], Optional[str]], None],
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> None:
+        """
+        Poll the files named by inputs() and, whenever one changes (and once at start),
+        call load() for the current entries and refresh them. report(results, error) is
+        called after each refresh that rendered something or failed to load.
+        """
+        if self.engine != "python":
+            # Pay the NumPy import now rather than on the first edit
+            from importlib import import_module
+
+            import_module(".vectorized", __package__)
+        last = None
+        while not should_stop():
+            sig = _signature(inputs())
+            if sig != last:
+                last = sig
+                try:
+                    entries = load()
+                except Exception as e:  # e.g. a manifest saved half-way; wait for the next change
+                    report([], str(e))
+                else:
+                    results = self.refresh(entries)
+                    if results:
+                        report(results, None)
+            time.sleep(poll_seconds)
+
+
+__all__ = [
+    "DEFAULT_POLL_SECONDS",
+    "Watcher",
+]
@@ -2,15 +2,18 @@ from __future__ import annotations
 
 import argparse
 import sys
-from typing import List
+import time
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from gradient_text import (
-    ColorStop,
-    per_letter_gradient_frames,
-    per_letter_gradient_frames_multi,
-    frames_to_yaml,
-)
-from gradient_text import presets as presets_mgr
+# Only the lightweight modules the parser needs are imported up front. The CLI is
+# often run thousands of times in a row, so everything else (rendering, the cache,
+# batch/watch/serve machinery, NumPy) is imported by the code path that uses it.
+from gradient_text import colorspace
+from gradient_text import emitters
+
+if TYPE_CHECKING:
+    from gradient_text import ColorStop
+    from gradient_text import batch as batch_mgr
 
 
 def parse_args(argv: List[str]) -> argparse.Namespace:
@@ -20,6 +23,8 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     g = p.add_mutually_exclusive_group()
     g.add_argument("--preset", help="Name of a saved preset (created in the GUI)")
     g.add_argument("--colors", nargs="+", help="Hex color stops like #3B28CC #3E7FF5 ... left->right (single gradient)")
+    g.add_argument("--batch", metavar="MANIFEST", help="Render every job in a manifest file ('-' for stdin): a JSON list of preset-style jobs, or one JSON object / preset name per line")
+    g.add_argument("--all-presets", nargs="?", const="*", metavar="GLOB", help="Render every saved preset (or those matching GLOB, e.g. 'lobby-*') to <out-dir>/<name>.yml; presets unchanged since their last output are skipped")
 
     # Multi-gradient via CLI: repeatable sets
     p.add_argument("--colors-set", nargs="+", action="append", help="Provide a gradient as a list of hex colors; repeat this flag up to 10 times for multiple gradients")
@@ -27,108 +32,336 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     # Shared/common options
     p.add_argument("--positions", nargs="*", type=float, help="Optional positions (0..1) for --colors only. If omitted, distributed evenly.")
     p.add_argument("--text", help="Text to color, e.g. play.example.com")
-    p.add_argument("--frames", type=int, default=48, help="Number of frames/lines to output")
+    p.add_argument("--frames", type=int, default=None, help="Number of frames/lines to output (default 48)")
     p.add_argument("--interval", type=int, default=200, help="change-interval in ms")
     p.add_argument("--mode", choices=["wrap", "pingpong"], default="wrap", help="Shift mode")
     p.add_argument("--shift-per-frame", type=float, default=None, help="Optional shift per frame in 0..1; default 1/len(text)")
     p.add_argument("--root-key", default="web", help="YAML root key")
     p.add_argument("--list-key", default="texts", help="YAML list key")
     p.add_argument("--out", default="-", help="Output file path or '-' for stdout")
+    p.add_argument("--compact", action="store_true", help="Only emit a color code when the color changes, and none on spaces")
+    p.add_argument("--format", choices=list(emitters.CONTAINERS), default=None, help="Output container (default: yaml)")
+    p.add_argument("--codes", choices=list(emitters.STYLES), default=None, help="Color code style: ampersand '&#RRGGBB' (default), minimessage '<#RRGGBB>' or legacy '§x§R§R§G§G§B§B'")
+    p.add_argument("--space", choices=list(colorspace.SPACES), default=None, help="Blend gradient stops in plain sRGB ('rgb', default), 'linear' RGB, 'oklab' (perceptual, no muddy midpoints) or 'hsv'; overrides a preset's choice")
+    p.add_argument("--formatting", action="store_true", help="Read Minecraft formatting codes (&l bold, &o italic, ..., &r reset) in the text and keep them around the color codes; whitespace gets no color code")
+    p.add_argument("--graphemes", action="store_true", help="Color whole grapheme clusters (accented letters, emoji sequences, flags) with one code each and place them by visible width (wide CJK/emoji take two steps)")
+    p.add_argument("--resolution", type=_resolution_arg, default=None, help="Sample each gradient once into a lookup table of N steps (e.g. 4096), or 'auto' for the exact grid of this text/shift")
+    p.add_argument("--engine", choices=["auto", "python", "numpy"], default="auto", help="Frame renderer; 'auto' uses NumPy when installed")
+    p.add_argument("--no-cache", action="store_true", help="Always render; don't read or write the render cache")
+    p.add_argument("--clear-cache", action="store_true", help="Delete all cached renders first (exits if nothing else to do)")
+    p.add_argument("--workers", type=int, default=None, help="Batch mode: number of worker processes (default: CPU count)")
+    p.add_argument("--out-dir", default=".", help="Batch mode: directory for jobs without an explicit 'out'")
+    p.add_argument("--summary", help="Batch mode: also write per-job results as JSON to this file")
+    p.add_argument("--watch", action="store_true", help="With --preset/--batch/--all-presets: keep running, and re-render only the jobs whose spec changed whenever the presets or manifest file change (--out/out-dir files are replaced atomically)")
+    p.add_argument("--poll-ms", type=int, default=None, help="--watch: how often to check the inputs for changes (default 50)")
+    p.add_argument("--force", action="store_true", help="--all-presets: re-render presets even if their output is up to date")
+    p.add_argument("--serve", nargs="?", const="", metavar="[HOST:]PORT", help="Run an HTTP render service (POST /render with a JSON spec, GET /stats); default 127.0.0.1:8765")
+    p.add_argument("--lru-entries", type=int, default=None, help="--serve: recent renders kept in memory (default 512)")
+    p.add_argument("--cache-size-mb", type=float, default=None, help="Render cache size limit (default 64); least recently used entries are evicted")
     return p.parse_args(argv)
 
 
+def _resolution_arg(value: str) -> int | str:
+    if value == "auto":
+        return value
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("must be a positive integer or 'auto'")
+    if n <= 0:
+        raise argparse.ArgumentTypeError("must be a positive integer or 'auto'")
+    return n
+
+
 def _build_stops_from_colors(colors: List[str], positions: List[float] | None = None) -> List[ColorStop]:
-    pos = positions or []
-    if pos and len(pos) != len(colors):
+    from gradient_text.jobs import stops_from_colors
+
+    if positions and len(positions) != len(colors):
         raise ValueError("--positions must have same length as --colors")
-    if not pos:
-        if len(colors) == 1:
-            pos = [0.0]
-        else:
-            pos = [i / (len(colors) - 1) for i in range(len(colors))]
-    return [ColorStop.from_hex(p, c) for p, c in zip(pos, colors)]
+    return stops_from_colors(colors, positions)
+
+
+def _cache_max_bytes(ns: argparse.Namespace) -> int:
+    from gradient_text import cache as render_cache
+
+    if ns.cache_size_mb is None:
+        return render_cache.DEFAULT_MAX_BYTES
+    return int(ns.cache_size_mb * 1024 * 1024)
 
 
 def main(argv: List[str] | None = None) -> int:
     ns = parse_args(argv or sys.argv[1:])
 
+    if ns.clear_cache:
+        from gradient_text import cache as render_cache
+
+        removed = render_cache.clear()
+        print(f"Cleared {removed} cached renders", file=sys.stderr)
+        if not ns.preset and not ns.text and not ns.batch and not ns.all_presets:
+            return 0
+
+    if ns.serve is not None:
+        return _run_serve(ns)
+
+    if ns.watch:
+        return _run_watch(ns)
+
+    if ns.batch or ns.all_presets:
+        return _run_batch(ns)
+
+    from gradient_text import compile_gradient
+    from gradient_text import presets as presets_mgr
+    from gradient_text.jobs import RenderJob, render_job
+
+    base = _base_spec(ns)
     if ns.preset:
         data = presets_mgr.get_preset(ns.preset)
         if not data:
             print(f"Error: preset '{ns.preset}' not found", file=sys.stderr)
             return 2
-        text = data.get("text")
-        if not text:
-            print("Error: preset missing text", file=sys.stderr)
-            return 2
-        frames = int(data.get("frames", ns.frames))
-        interval = int(data.get("interval", ns.interval))
-        mode = data.get("shift_mode", ns.mode)
-        spf = data.get("shift_per_frame", ns.shift_per_frame)
-        root_key = data.get("root_key", ns.root_key)
-        list_key = data.get("list_key", ns.list_key)
-        grads_data = data.get("gradients", [])
-        if not grads_data:
-            print("Error: preset has no gradients", file=sys.stderr)
+        try:
+            job = RenderJob.from_dict(data, base=base, what="preset")
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
             return 2
-        stops_list = []
-        for g in grads_data[:10]:
-            stops = []
-            for stop in g:
-                positions = float(stop.get("position", 0.0))
-                color = str(stop.get("color"))
-                stops.append(ColorStop.from_hex(positions, color))
-            stops_list.append(stops)
-        frames_out = per_letter_gradient_frames_multi(
-            text=text,
-            stops_list=stops_list,
-            num_frames=max(1, frames),
-            shift_mode=mode,
-            shift_per_frame=spf,
-        )
-        y = frames_to_yaml(
-            frames_out,
-            change_interval_ms=max(1, interval),
-            root_key=root_key,
-            list_key=list_key,
-        )
+        # --compact, --resolution, --format and --codes are output choices, not part of the preset
+        job.compact = ns.compact
+        job.resolution = ns.resolution
+        job.format = base["format"]
+        job.codes = base["codes"]
+        if ns.space:
+            job.space = ns.space
+        if ns.formatting:
+            job.formatting = True
+        if ns.graphemes:
+            job.graphemes = True
     else:
         # Manual mode
         text = ns.text
         if not text:
             print("Error: --text is required (or use --preset)", file=sys.stderr)
             return 2
-        stops_list: List[List[ColorStop]] = []
+        stops_list = []
         if ns.colors:
-            stops_list.append(_build_stops_from_colors(ns.colors, ns.positions))
+            stops_list.append(compile_gradient(_build_stops_from_colors(ns.colors, ns.positions), base["space"]))
         if ns.colors_set:
             for color_set in ns.colors_set:
-                stops_list.append(_build_stops_from_colors(color_set, None))
+                stops_list.append(compile_gradient(_build_stops_from_colors(color_set, None), base["space"]))
         if not stops_list:
             print("Error: provide --colors or --colors-set (or use --preset)", file=sys.stderr)
             return 2
-        frames_out = per_letter_gradient_frames_multi(
+        job = RenderJob(
             text=text,
-            stops_list=stops_list,
-            num_frames=max(1, ns.frames),
+            gradients=stops_list,
+            frames=base["frames"],
+            interval=ns.interval,
             shift_mode=ns.mode,
             shift_per_frame=ns.shift_per_frame,
-        )
-        y = frames_to_yaml(
-            frames_out,
-            change_interval_ms=max(1, ns.interval),
             root_key=ns.root_key,
             list_key=ns.list_key,
+            compact=ns.compact,
+            resolution=ns.resolution,
+            format=base["format"],
+            codes=base["codes"],
+            space=base["space"],
+            formatting=ns.formatting,
+            graphemes=ns.graphemes,
         )
 
+    # Frames are streamed straight to the output, so memory stays flat for any frame count
+    render_opts = dict(use_cache=not ns.no_cache, engine=ns.engine, max_bytes=_cache_max_bytes(ns))
     if ns.out == "-":
-        sys.stdout.write(y)
+        result = render_job(job, sys.stdout, **render_opts)
     else:
         with open(ns.out, "w", encoding="utf-8") as f:
-            f.write(y)
-        print(f"Wrote {len(y.splitlines())} lines to {ns.out}")
+            result = render_job(job, f, **render_opts)
+        print(f"Wrote {result.lines} lines to {ns.out}" + (" (cached)" if result.cached else ""))
+    if job.compact and not (job.formatting or job.graphemes) and not result.cached:
+        print(f"Compact mode saved {result.bytes_saved} bytes", file=sys.stderr)
+    return 0
+
+
+def _base_spec(ns: argparse.Namespace) -> Dict[str, Any]:
+    """Spec values from the command line, used where a preset leaves them out."""
+    return {
+        "frames": 48 if ns.frames is None else ns.frames,
+        "interval": ns.interval,
+        "shift_mode": ns.mode,
+        "shift_per_frame": ns.shift_per_frame,
+        "root_key": ns.root_key,
+        "list_key": ns.list_key,
+        "compact": ns.compact,
+        "resolution": ns.resolution,
+        "format": ns.format or "yaml",
+        "codes": ns.codes or "ampersand",
+        "space": ns.space or "rgb",
+        "formatting": ns.formatting,
+        "graphemes": ns.graphemes,
+    }
+
+
+def _output_overrides(ns: argparse.Namespace) -> Dict[str, Any]:
+    # --compact, --resolution, --format and --codes are output choices, not part of a preset
+    base = _base_spec(ns)
+    overrides = {k: base[k] for k in ("compact", "resolution", "format", "codes")}
+    # The blend space belongs to the preset; only an explicit --space replaces it
+    if ns.space:
+        overrides["space"] = ns.space
+    if ns.formatting:
+        overrides["formatting"] = True
+    if ns.graphemes:
+        overrides["graphemes"] = True
+    return overrides
+
+
+def _batch_entries(ns: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Manifest entries for --all-presets or --batch; ValueError describes unusable input."""
+    from gradient_text import batch as batch_mgr
+
+    if ns.all_presets:
+        entries = batch_mgr.preset_entries(ns.all_presets, **_output_overrides(ns))
+        if not entries:
+            raise ValueError(f"no presets match '{ns.all_presets}'")
+    else:
+        if ns.batch == "-":
+            manifest = sys.stdin.read()
+        else:
+            with open(ns.batch, "r", encoding="utf-8") as f:
+                manifest = f.read()
+        try:
+            entries = batch_mgr.parse_manifest(manifest)
+        except (ValueError, KeyError) as e:
+            raise ValueError(f"invalid manifest: {e}")
+        # Jobs that don't choose their own output options, blend space, formatting or segmentation get the
+        # ones given on the command line; as with --preset, these win over the job's base preset
+        given = {k: v for k, v in _output_overrides(ns).items() if _explicit(ns, k)}
+        for entry in entries:
+            for key, value in given.items():
+                entry.setdefault(key, value)
+    if ns.frames is not None:
+        # --frames is only a fallback: a job's base preset keeps its own frame count
+        from gradient_text import presets as presets_mgr
+
+        for entry in entries:
+            if "frames" not in entry:
+                base = presets_mgr.get_preset(entry["preset"]) if entry.get("preset") else None
+                if not (base and "frames" in base):
+                    entry["frames"] = ns.frames
+    return entries
+
+
+def _explicit(ns: argparse.Namespace, key: str) -> bool:
+    """Whether the output option `key` was given on the command line rather than defaulted."""
+    return bool(getattr(ns, key)) if key in ("compact", "formatting", "graphemes") else getattr(ns, key) is not None
+
+
+def _preset_entry(ns: argparse.Namespace) -> List[Dict[str, Any]]:
+    from gradient_text import presets as presets_mgr
+
+    data = presets_mgr.get_preset(ns.preset)
+    if not data:
+        raise ValueError(f"preset '{ns.preset}' not found")
+    return [{**_base_spec(ns), **data, **_output_overrides(ns), "name": ns.preset, "out": ns.out}]
+
+
+def _run_watch(ns: argparse.Namespace) -> int:
+    from gradient_text import batch as batch_mgr
+    from gradient_text import presets as presets_mgr
+    from gradient_text import watch as watch_mgr
+
+    index = str(presets_mgr.index_path())
+    if ns.batch:
+        if ns.batch == "-":
+            print("Error: --watch needs a manifest file, not stdin", file=sys.stderr)
+            return 2
+        load, inputs = (lambda: _batch_entries(ns)), [ns.batch, index]
+    elif ns.all_presets:
+        load, inputs = (lambda: _batch_entries(ns)), [index]
+    elif ns.preset:
+        if ns.out == "-":
+            print("Error: --watch with --preset needs --out FILE", file=sys.stderr)
+            return 2
+        load, inputs = (lambda: _preset_entry(ns)), [index]
+    else:
+        print("Error: --watch needs --preset, --batch or --all-presets", file=sys.stderr)
+        return 2
+
+    def report(results: List[batch_mgr.BatchResult], error: str | None) -> None:
+        stamp = time.strftime("%H:%M:%S")
+        if error:
+            print(f"[{stamp}] Error: {error}", file=sys.stderr)
+        else:
+            wall = sum(r.seconds for r in results)
+            print(f"[{stamp}] " + batch_mgr.format_summary(results, wall_seconds=wall), file=sys.stderr)
+
+    watcher = watch_mgr.Watcher(
+        out_dir=ns.out_dir,
+        use_cache=not ns.no_cache,
+        engine=ns.engine,
+        max_bytes=_cache_max_bytes(ns),
+    )
+    poll_ms = watch_mgr.DEFAULT_POLL_SECONDS * 1000 if ns.poll_ms is None else ns.poll_ms
+    print(f"Watching {', '.join(inputs)} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        watcher.run(load, lambda: inputs, report, poll_seconds=max(1, poll_ms) / 1000)
+    except KeyboardInterrupt:
+        pass
     return 0
 
 
+def _run_serve(ns: argparse.Namespace) -> int:
+    from gradient_text import server as server_mgr
+
+    host, _sep, port = (ns.serve or str(server_mgr.DEFAULT_PORT)).rpartition(":")
+    try:
+        port_num = int(port)
+    except ValueError:
+        print(f"Error: --serve expects [HOST:]PORT, got {ns.serve!r}", file=sys.stderr)
+        return 2
+    service = server_mgr.RenderService(
+        max_entries=max(1, server_mgr.DEFAULT_MAX_ENTRIES if ns.lru_entries is None else ns.lru_entries),
+        engine=ns.engine,
+        # The on-disk cache is shared with the CLI; opt out with --no-cache as usual
+        use_disk_cache=not ns.no_cache,
+    )
+    try:
+        httpd = server_mgr.RenderServer((host or "127.0.0.1", port_num), service)
+    except OSError as e:
+        print(f"Error: cannot listen on {ns.serve}: {e}", file=sys.stderr)
+        return 2
+    print(f"Serving on {httpd.url} (POST /render, GET /stats; Ctrl+C to stop)", file=sys.stderr)
+    with httpd:
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def _run_batch(ns: argparse.Namespace) -> int:
+    from gradient_text import batch as batch_mgr
+
+    try:
+        entries = _batch_entries(ns)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    results = batch_mgr.run_batch(
+        entries,
+        out_dir=ns.out_dir,
+        workers=ns.workers,
+        use_cache=not ns.no_cache,
+        engine=ns.engine,
+        max_bytes=_cache_max_bytes(ns),
+        skip_unchanged=bool(ns.all_presets) and not ns.force,
+    )
+    print(batch_mgr.format_summary(results, wall_seconds=time.perf_counter() - start), file=sys.stderr)
+    if ns.summary:
+        with open(ns.summary, "w", encoding="utf-8") as f:
+            f.write(batch_mgr.results_to_json(results))
+    return 0 if all(r.ok for r in results) else 1
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,152 @@
+"""
+Multi-process stress test for the preset store.
+
+    python stress_presets.py                          # 8 writers, 2 readers
+    python stress_presets.py --writers 32 --presets 500
+
+Writer processes put, update and delete presets concurrently (plus one name they
+all overwrite) while reader processes continuously list, get and load presets,
+each from several threads sharing the process's cached index (as the server does).
+The store starts as a legacy presets.json, so the migration race is covered too,
+and a low compaction threshold forces many log rewrites under the readers.
+Runs in a temporary presets directory; exits non-zero if a reader saw a bad
+record or the final store is missing or has unexpected presets.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Set
+
+
+def _writer(i: int, count: int, compact_bytes: int) -> None:
+    from gradient_text import presets as presets_mgr
+
+    presets_mgr._COMPACT_MIN_DEAD_BYTES = compact_bytes
+    for k in range(count):
+        name = f"w{i}-{k}"
+        presets_mgr.put_preset(name, {"name": name, "text": f"writer {i} preset {k} " + "x" * (k % 50)})
+        if k % 5 == 0:
+            presets_mgr.put_preset("shared", {"name": "shared", "text": f"writer {i}", "k": k})
+        if k % 7 == 0 and k:
+            presets_mgr.delete_preset(f"w{i}-{k - 1}")
+
+
+def _reader(stop, errors, reads, threads: int) -> None:
+    workers = [threading.Thread(target=_read_loop, args=(stop, errors, reads)) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+
+def _read_loop(stop, errors, reads) -> None:
+    from gradient_text import presets as presets_mgr
+
+    n = 0
+    while not stop.is_set():
+        try:
+            names = presets_mgr.list_preset_names()
+            for name in names[:: max(1, len(names) // 20)]:
+                p = presets_mgr.get_preset(name)
+                # None is fine: deleted between the listing and the lookup
+                if p is not None and p.get("name") != name:
+                    raise ValueError(f"{name!r} returned record for {p.get('name')!r}")
+                n += 1
+            if n % 10 == 0:
+                for name, p in presets_mgr.load_presets()["presets"].items():
+                    if p.get("name") != name:
+                        raise ValueError(f"load_presets: {name!r} holds record for {p.get('name')!r}")
+        except Exception as e:
+            with errors.get_lock():
+                errors.value += 1
+            print(f"reader error: {e!r}", file=sys.stderr)
+    with reads.get_lock():
+        reads.value += n
+
+
+def expected_names(writers: int, count: int, legacy: int) -> Set[str]:
+    names = {f"legacy{j}" for j in range(legacy)}
+    for i in range(writers):
+        for k in range(count):
+            names.add(f"w{i}-{k}")
+        for k in range(7, count, 7):
+            names.discard(f"w{i}-{k - 1}")
+    names.add("shared")
+    return names
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Hammer the preset store from many processes at once.")
+    p.add_argument("--writers", type=int, default=8, help="Writer processes")
+    p.add_argument("--readers", type=int, default=2, help="Reader processes")
+    p.add_argument("--reader-threads", type=int, default=4, help="Threads in each reader process")
+    p.add_argument("--presets", type=int, default=200, help="Presets written by each writer")
+    p.add_argument("--legacy", type=int, default=100, help="Presets in the presets.json to migrate")
+    p.add_argument("--compact-bytes", type=int, default=16 * 1024, help="Dead log bytes before compaction")
+    ns = p.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Child processes inherit this, so every one of them uses the scratch store
+        os.environ["APPDATA"] = tmp
+        store = Path(tmp) / "gradient_text"
+        store.mkdir()
+        legacy = {f"legacy{j}": {"name": f"legacy{j}", "text": f"legacy {j}"} for j in range(ns.legacy)}
+        with open(store / "presets.json", "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "presets": legacy}, f, indent=2)
+
+        stop = mp.Event()
+        errors = mp.Value("i", 0)
+        reads = mp.Value("i", 0)
+        readers = [mp.Process(target=_reader, args=(stop, errors, reads, ns.reader_threads)) for _ in range(ns.readers)]
+        writers = [mp.Process(target=_writer, args=(i, ns.presets, ns.compact_bytes)) for i in range(ns.writers)]
+        start = time.perf_counter()
+        for proc in writers + readers:
+            proc.start()
+        for proc in writers:
+            proc.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for proc in readers:
+            proc.join()
+
+        from gradient_text import presets as presets_mgr
+
+        failed = [proc for proc in writers if proc.exitcode != 0]
+        got = set(presets_mgr.list_preset_names())
+        want = expected_names(ns.writers, ns.presets, ns.legacy)
+        loaded = presets_mgr.load_presets()["presets"]
+        ops = ns.writers * (ns.presets + len(range(0, ns.presets, 5)) + len(range(7, ns.presets, 7)))
+        print(f"{ns.writers} writers x {ns.presets} presets: {ops} writes in {elapsed:.2f} s "
+              f"({ops / elapsed:.0f}/s), {reads.value} reads, {len(got)} presets, "
+              f"{len(list(store.glob('presets.*.jsonl')))} log file(s)")
+        ok = True
+        if failed:
+            print(f"FAIL: {len(failed)} writer processes crashed", file=sys.stderr)
+            ok = False
+        if errors.value:
+            print(f"FAIL: readers hit {errors.value} errors", file=sys.stderr)
+            ok = False
+        if got != want:
+            print(f"FAIL: {len(want - got)} presets lost, {len(got - want)} unexpected "
+                  f"(e.g. {sorted(want - got)[:5]} / {sorted(got - want)[:5]})", file=sys.stderr)
+            ok = False
+        if set(loaded) != got or any(p.get("name") != n for n, p in loaded.items()):
+            print("FAIL: load_presets disagrees with the index", file=sys.stderr)
+            ok = False
+        if not (store / "presets.json.migrated").exists():
+            print("FAIL: presets.json was not migrated", file=sys.stderr)
+            ok = False
+        print("OK" if ok else "FAILED")
+        return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())